@@ -0,0 +1,89 @@
+"""
+DuckDB extension installation shared by the entry point and the Spec Engine.
+
+INSTALL downloads the extension and writes it to the local extension directory,
+so several installs can run at once on separate cursors. LOAD changes the state
+of the connection and is therefore done afterwards, one extension at a time.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+
+def _install_extension(
+    con: duckdb.DuckDBPyConnection, ext: str
+) -> tuple[str | None, Exception | None]:
+    """
+    Install an extension from the core repository, falling back to community.
+    Returns (source, None) on success or (None, error) on failure.
+    """
+    cursor = con.cursor()
+    try:
+        try:
+            cursor.sql(f"INSTALL {ext};")
+            return "core", None
+        except Exception:
+            cursor.sql(f"INSTALL {ext} FROM community;")
+            return "community", None
+    except Exception as e:
+        return None, e
+    finally:
+        cursor.close()
+
+
+def install_and_load_extensions(
+    con: duckdb.DuckDBPyConnection, extensions: list[str], max_workers: int = 8
+) -> list[tuple[str, str | None, Exception | None]]:
+    """
+    Install extensions concurrently, then load them in order on con.
+
+    Args:
+        con: DuckDB connection to load the extensions into
+        extensions: Extension names, in load order
+        max_workers: Maximum number of concurrent installs
+
+    Returns:
+        One (name, source, error) tuple per extension, in input order. source is
+        'core' or 'community' when the extension loaded, error is set otherwise.
+    """
+    if not extensions:
+        return []
+
+    # Already installed extensions skip INSTALL (and its repository round trip);
+    # already loaded ones skip LOAD as well
+    status = {
+        name: (installed, loaded, installed_from)
+        for name, installed, loaded, installed_from in con.execute(
+            """
+            SELECT extension_name, installed, loaded, installed_from
+            FROM duckdb_extensions()
+            WHERE extension_name IN (SELECT UNNEST(?::VARCHAR[]))
+            """,
+            [extensions],
+        ).fetchall()
+    }
+
+    installs = {}
+    for ext in extensions:
+        installed, _, installed_from = status.get(ext, (False, False, None))
+        if installed:
+            installs[ext] = ("community" if installed_from == "community" else "core", None)
+    missing = [ext for ext in extensions if ext not in installs]
+
+    if missing:
+        workers = min(max_workers, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda ext: _install_extension(con, ext), missing)
+            installs.update(zip(missing, results))
+
+    results = []
+    for ext in extensions:
+        source, error = installs[ext]
+        if error is None and not status.get(ext, (False, False, None))[1]:
+            try:
+                con.sql(f"LOAD {ext};")
+            except Exception as e:
+                source, error = None, e
+        results.append((ext, source, error))
+    return results
@@ -12,119 +12,165 @@ The Spec Engine manages specifications for:
 Entry point for the MCP server.
 """
 
-import json
+import importlib
+import logging
+import logging.handlers
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import duckdb
 
+from . import _json
+from .extensions import install_and_load_extensions
+
+logger = logging.getLogger(__name__)
+
+# Quoted literals (with doubled-quote escapes, running to EOF if unterminated),
+# line comments, and statement terminators. Only ';' matches end a statement;
+# the other alternatives exist so the scanner skips over their contents.
+_SQL_TOKEN_RE = re.compile(
+    r"'[^']*(?:''[^']*)*(?:'|$)"
+    r'|"[^"]*(?:""[^"]*)*(?:"|$)'
+    r"|--[^\n]*"
+    r"|;"
+)
+# First non-blank character of a line that does not start a "--" comment
+_CONTENT_LINE_RE = re.compile(r"^\s*(?!--)\S", re.MULTILINE)
+
+
+def _list_sql_files(sql_dir: Path) -> tuple[Path, ...]:
+    """Sorted .sql files in sql_dir from a single directory scan (empty if missing)."""
+    try:
+        with os.scandir(sql_dir) as entries:
+            names = sorted(e.name for e in entries if e.name.endswith(".sql") and e.is_file())
+    except FileNotFoundError:
+        return ()
+    return tuple(sql_dir / name for name in names)
+
+
+# Macro files ship with the package, so the listing is fixed for the process
+_SQL_DIR = Path(__file__).parent / "sql"
+_SQL_FILES = _list_sql_files(_SQL_DIR)
+
 
 def _has_non_comment_content(stmt: str) -> bool:
     """Check if a SQL statement has any non-comment content."""
-    for ln in stmt.split("\n"):
-        ln = ln.strip()
-        if ln and not ln.startswith("--"):
-            return True
-    return False
+    return _CONTENT_LINE_RE.search(stmt) is not None
 
 
 def split_sql_statements(sql_content: str) -> list[str]:
-    """Split SQL content into statements, respecting string literals."""
+    """Split SQL content into statements, respecting string literals and line comments."""
+    if ";" not in sql_content:
+        # Single statement (or none): nothing to tokenize
+        stmt = sql_content.strip()
+        return [stmt] if stmt and _has_non_comment_content(stmt) else []
+
     statements = []
-    current = []
-    in_string = False
-    string_char = None
-
-    i = 0
-    while i < len(sql_content):
-        char = sql_content[i]
-
-        if char in ("'", '"') and not in_string:
-            in_string = True
-            string_char = char
-            current.append(char)
-        elif char == string_char and in_string:
-            if i + 1 < len(sql_content) and sql_content[i + 1] == string_char:
-                current.append(char)
-                current.append(char)
-                i += 1
-            else:
-                in_string = False
-                string_char = None
-                current.append(char)
-        elif char == ";" and not in_string:
-            stmt = "".join(current).strip()
-            if stmt and _has_non_comment_content(stmt):
-                statements.append(stmt)
-            current = []
-        else:
-            current.append(char)
-        i += 1
+    start = 0
 
-    if current:
-        stmt = "".join(current).strip()
+    for match in _SQL_TOKEN_RE.finditer(sql_content):
+        if match.group() != ";":
+            continue
+        stmt = sql_content[start : match.start()].strip()
         if stmt and _has_non_comment_content(stmt):
             statements.append(stmt)
+        start = match.end()
+
+    stmt = sql_content[start:].strip()
+    if stmt and _has_non_comment_content(stmt):
+        statements.append(stmt)
 
     return statements
 
 
+def _read_json(path: Path) -> tuple[Path, Any]:
+    """Read a JSON file, returning (path, data) or (path, exception)."""
+    try:
+        return path, _json.loads(path.read_bytes())
+    except Exception as e:
+        return path, e
+
+
 def find_mcp_config() -> list[tuple[str, dict]]:
     """
     Discover MCP configuration files in standard locations.
     Returns list of (config_path, config_data) tuples.
     """
-    config_locations = [
-        # Project-local
-        Path.cwd() / "mcp.json",
-        Path.cwd() / ".mcp.json",
-        Path.cwd() / "mcp_config.json",
+    # Project-local: a stat per candidate, since the working directory may be a
+    # repo root or home directory with thousands of entries
+    cwd = Path.cwd()
+    local_locations = [cwd / "mcp.json", cwd / ".mcp.json", cwd / "mcp_config.json"]
+    home = Path.home()
+    home_locations = [
         # Claude Desktop standard locations
-        Path.home() / ".config" / "claude" / "claude_desktop_config.json",
+        home / ".config" / "claude" / "claude_desktop_config.json",
         # Windows
-        Path.home() / "AppData" / "Roaming" / "Claude" / "claude_desktop_config.json",
+        home / "AppData" / "Roaming" / "Claude" / "claude_desktop_config.json",
         # macOS
-        Path.home() / "Library" / "Application Support" / "Claude" / "claude_desktop_config.json",
+        home / "Library" / "Application Support" / "Claude" / "claude_desktop_config.json",
         # Generic MCP config
-        Path.home() / ".mcp" / "config.json",
+        home / ".mcp" / "config.json",
     ]
 
+    # One listing per home sub-directory instead of a stat per candidate; these
+    # directories are small, and most of them don't exist at all.
+    present: dict[Path, set[str]] = {}
+    for parent in dict.fromkeys(p.parent for p in home_locations):
+        try:
+            with os.scandir(parent) as entries:
+                present[parent] = {entry.name for entry in entries}
+        except OSError:
+            present[parent] = set()
+
+    existing = [p for p in local_locations if p.is_file()]
+    existing += [p for p in home_locations if p.name in present[p.parent]]
+    if not existing:
+        return []
+
+    # Reads are I/O-bound (home directories may be network mounts)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_read_json, existing))
+
     found_configs = []
-    for config_path in config_locations:
-        if config_path.exists():
-            try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    config_data = json.load(f)
-                found_configs.append((str(config_path), config_data))
-                print(f"Found MCP config: {config_path}", file=sys.stderr)
-            except Exception as e:
-                print(f"Error reading {config_path}: {e}", file=sys.stderr)
+    for config_path, config_data in results:
+        if isinstance(config_data, Exception):
+            logger.error(f"Error reading {config_path}: {config_data}")
+            continue
+        found_configs.append((str(config_path), config_data))
+        logger.info(f"Found MCP config: {config_path}")
 
     return found_configs
 
 
-def extract_mcp_servers(configs: list[tuple[str, dict]]) -> dict:
+def extract_mcp_servers(configs: list[tuple[str, dict]]) -> dict[str, tuple[str, dict]]:
     """
     Extract MCP server definitions from config files.
-    Returns dict of server_name -> server_config
+    Returns dict of server_name -> (config_path, server_config); the server
+    config is the parsed dict itself, not a copy.
     """
     servers = {}
     for config_path, config_data in configs:
-        # Handle claude_desktop_config.json format
-        if "mcpServers" in config_data:
-            for name, server_config in config_data["mcpServers"].items():
-                servers[name] = {"source": config_path, **server_config}
-        # Handle simple mcp.json format
-        elif "servers" in config_data:
-            for name, server_config in config_data["servers"].items():
-                servers[name] = {"source": config_path, **server_config}
+        # Handle claude_desktop_config.json format, then simple mcp.json format
+        entries = config_data.get("mcpServers")
+        if entries is None:
+            entries = config_data.get("servers", {})
+        for name, server_config in entries.items():
+            servers[name] = (config_path, server_config)
     return servers
 
 
-def setup_mcp_tables(con: duckdb.DuckDBPyConnection, servers: dict) -> None:
+def setup_mcp_tables(con: duckdb.DuckDBPyConnection, servers: dict[str, tuple[str, dict]]) -> None:
     """
-    Create tables with discovered MCP server info for SQL access.
+    Create the mcp_servers table and fill it with discovered MCP server info.
+    This is the only place the table is defined; with no servers it is left empty.
+
+    Args:
+        con: DuckDB connection
+        servers: server_name -> (config_path, server_config), as from extract_mcp_servers
     """
     con.sql("""
         CREATE OR REPLACE TABLE mcp_servers (
@@ -136,18 +182,32 @@ def setup_mcp_tables(con: duckdb.DuckDBPyConnection, servers: dict) -> None:
         )
     """)
 
-    for name, config in servers.items():
-        command = config.get("command", "")
-        args = config.get("args", [])
-        env = json.dumps(config.get("env", {}))
-        source = config.get("source", "")
-
+    names = list(servers)
+    sources = [source for source, _ in servers.values()]
+    configs = [config for _, config in servers.values()]
+    commands = [config.get("command", "") for config in configs]
+    args_list = [config.get("args", []) for config in configs]
+    envs = [config.get("env", {}) for config in configs]
+
+    # Bind each column as one list and let DuckDB zip them back into rows,
+    # so the whole batch goes through the binder once. The env dicts have no
+    # common shape to bind natively, so they travel as a single JSON array
+    # document that DuckDB splits into one JSON value per row.
+    if names:
         con.execute(
-            "INSERT INTO mcp_servers VALUES (?, ?, ?, ?, ?)",
-            [name, command, args, env, source],
+            """
+            INSERT INTO mcp_servers
+            SELECT
+                UNNEST(?::VARCHAR[]),
+                UNNEST(?::VARCHAR[]),
+                UNNEST(?::VARCHAR[][]),
+                UNNEST(?::JSON::JSON[]),
+                UNNEST(?::VARCHAR[])
+            """,
+            [names, commands, args_list, _json.dumps(envs), sources],
         )
 
-    print(f"Registered {len(servers)} MCP servers in mcp_servers table", file=sys.stderr)
+    logger.info(f"Registered {len(servers)} MCP servers in mcp_servers table")
 
 
 def load_core_extensions(con: duckdb.DuckDBPyConnection) -> list[str]:
@@ -192,23 +252,19 @@ def load_core_extensions(con: duckdb.DuckDBPyConnection) -> list[str]:
     ]
 
     loaded = []
-    for ext, required in extensions:
-        try:
-            con.sql(f"INSTALL {ext};")
-            con.sql(f"LOAD {ext};")
+    required_exts = {ext for ext, required in extensions if required}
+    results = install_and_load_extensions(con, [ext for ext, _ in extensions])
+    for ext, source, error in results:
+        if error is None:
             loaded.append(ext)
-            print(f"Loaded extension: {ext}", file=sys.stderr)
-        except Exception:
-            try:
-                con.sql(f"INSTALL {ext} FROM community;")
-                con.sql(f"LOAD {ext};")
-                loaded.append(ext)
-                print(f"Loaded extension {ext} from community", file=sys.stderr)
-            except Exception as e:
-                if required:
-                    print(f"REQUIRED extension {ext} failed: {e}", file=sys.stderr)
-                else:
-                    print(f"Skipping optional extension {ext}: {e}", file=sys.stderr)
+            if source == "community":
+                logger.info(f"Loaded extension {ext} from community")
+            else:
+                logger.info(f"Loaded extension: {ext}")
+        elif ext in required_exts:
+            logger.error(f"REQUIRED extension {ext} failed: {error}")
+        else:
+            logger.warning(f"Skipping optional extension {ext}: {error}")
 
     return loaded
 
@@ -218,30 +274,9 @@ def create_runtime_tables(con: duckdb.DuckDBPyConnection) -> None:
     Create runtime tables for session management, auditing, and approvals.
     These are operational tables, not specifications (specs live in spec_objects).
     """
-    con.sql("""
-        -- Audit log for all agent actions
-        CREATE TABLE IF NOT EXISTS audit_log (
-            id INTEGER PRIMARY KEY,
-            session_id VARCHAR NOT NULL,
-            timestamp TIMESTAMP DEFAULT now(),
-            entry_type VARCHAR NOT NULL,  -- 'tool_call', 'spec_access', 'feedback', 'learning'
-            spec_id INTEGER,              -- Reference to spec_objects if relevant
-            tool_name VARCHAR,
-            parameters JSON,
-            result JSON,
-            decision VARCHAR,             -- 'allowed', 'denied', 'approved', 'rejected'
-            violations VARCHAR[]
-        );
-
-        -- Session state for active agent sessions
-        CREATE TABLE IF NOT EXISTS agent_sessions (
-            id VARCHAR PRIMARY KEY,
-            agent_spec_id INTEGER,        -- Reference to spec_objects (kind='agent')
-            started_at TIMESTAMP DEFAULT now(),
-            status VARCHAR DEFAULT 'active',
-            context JSON DEFAULT '{}',    -- Session context/state
-            messages JSON DEFAULT '[]'
-        );
+    execute_sql_script(con, """
+        -- audit_log and agent_sessions come from schemas.AGENT_TABLES_SQL,
+        -- which runs first (create_agent_tables)
 
         -- Pending approvals for sensitive operations
         CREATE TABLE IF NOT EXISTS pending_approvals (
@@ -288,8 +323,55 @@ def create_runtime_tables(con: duckdb.DuckDBPyConnection) -> None:
         CREATE SEQUENCE IF NOT EXISTS audit_seq START 1;
         CREATE SEQUENCE IF NOT EXISTS approval_seq START 1;
         CREATE SEQUENCE IF NOT EXISTS org_call_seq START 1;
-    """)
-    print("Runtime tables created.", file=sys.stderr)
+    """, "runtime tables")
+    logger.info("Runtime tables created.")
+
+
+def execute_sql_script(
+    con: duckdb.DuckDBPyConnection,
+    sql_script: str,
+    label: str,
+) -> int:
+    """
+    Execute a multi-statement SQL script, returning the number of statements that succeeded.
+
+    The whole script is handed to DuckDB in one call inside a transaction, so it
+    is parsed once. If any statement fails (e.g. a macro referencing a missing
+    extension), the transaction is rolled back and the script is replayed one
+    statement at a time so the remaining statements still apply and the error
+    names the offending script.
+
+    Args:
+        con: DuckDB connection
+        sql_script: SQL text, statements separated by ';'
+        label: Name used in error messages
+
+    Returns:
+        Number of statements executed successfully
+    """
+    try:
+        con.begin()
+        con.execute(sql_script)
+        con.commit()
+        return len(split_sql_statements(sql_script))
+    except Exception:
+        con.rollback()
+
+    loaded = 0
+    for statement in split_sql_statements(sql_script):
+        try:
+            con.sql(statement)
+            loaded += 1
+        except Exception as e:
+            logger.error(f"Error in {label}: {e}")
+    return loaded
+
+
+def _execute_sql_file(con: duckdb.DuckDBPyConnection, sql_path: str, sql_file: str) -> int:
+    """Execute a SQL file via execute_sql_script."""
+    with open(sql_path, "r", encoding="utf-8") as f:
+        sql_script = f.read()
+    return execute_sql_script(con, sql_script, sql_file)
 
 
 def load_sql_macros(con: duckdb.DuckDBPyConnection) -> int:
@@ -297,53 +379,106 @@ def load_sql_macros(con: duckdb.DuckDBPyConnection) -> int:
     Load SQL macros from the sql/ directory.
     Returns total number of macros loaded.
     """
-    sql_dir = os.path.join(os.path.dirname(__file__), "sql")
     total_loaded = 0
 
-    if os.path.isdir(sql_dir):
-        sql_files = sorted(f for f in os.listdir(sql_dir) if f.endswith(".sql"))
-        for sql_file in sql_files:
-            sql_path = os.path.join(sql_dir, sql_file)
-            with open(sql_path, "r", encoding="utf-8") as f:
-                sql_script = f.read()
-            statements = split_sql_statements(sql_script)
-            loaded = 0
-            for statement in statements:
-                lines = [
-                    ln
-                    for ln in statement.split("\n")
-                    if ln.strip() and not ln.strip().startswith("--")
-                ]
-                if not lines:
-                    continue
-                try:
-                    con.sql(statement)
-                    loaded += 1
-                except Exception as e:
-                    print(f"Error in {sql_file}: {e}", file=sys.stderr)
-            total_loaded += loaded
-            print(f"Loaded {loaded} macros from {sql_file}", file=sys.stderr)
-    else:
-        print("Warning: sql/ directory not found, no macros loaded", file=sys.stderr)
+    if not _SQL_FILES:
+        logger.warning("Warning: no files in sql/ directory, no macros loaded")
+
+    for sql_path in _SQL_FILES:
+        loaded = _execute_sql_file(con, str(sql_path), sql_path.name)
+        total_loaded += loaded
+        logger.info(f"Loaded {loaded} macros from {sql_path.name}")
 
     return total_loaded
 
 
 def create_agent_tables(con: duckdb.DuckDBPyConnection) -> None:
     """
-    Create agent infrastructure tables (workspaces, security_policy, etc.).
+    Create agent infrastructure and org tables (workspaces, security_policy, orgs, etc.).
     These must exist before SQL macros are loaded, as macros reference them.
     """
-    from .schemas import AGENT_TABLES_SQL
+    from .schemas import ALL_TABLES_SQL
 
-    for stmt in AGENT_TABLES_SQL.split(";"):
-        stmt = stmt.strip()
-        if stmt and _has_non_comment_content(stmt):
-            try:
-                con.sql(stmt)
-            except Exception as e:
-                print(f"Error creating agent table: {e}", file=sys.stderr)
-    print("Agent infrastructure tables created.", file=sys.stderr)
+    # Executed as one script: DuckDB's parser handles the ';' inside the
+    # blocklist literals that a plain split(";") used to cut apart. A failing
+    # statement falls back to per-statement execution, so the rest still apply.
+    execute_sql_script(con, ALL_TABLES_SQL, "agent tables")
+    logger.info("Agent infrastructure tables created.")
+
+
+def _import_startup_modules() -> None:
+    """
+    Import the submodules main() needs later, on a background thread.
+
+    Extension INSTALLs are network-bound, so the import work overlaps with
+    them. main() still imports each module inline and reports ImportErrors there.
+    """
+    if not __package__:
+        return
+    for module in ("spec_engine", "udfs", "orgs"):
+        try:
+            importlib.import_module(f".{module}", __package__)
+        except ImportError:
+            pass
+
+
+class _BufferedStderrHandler(logging.handlers.BufferingHandler):
+    """
+    Collect formatted records and write them to stderr in one call when flushed.
+
+    Warnings and errors flush right away, so problems are never held back.
+    """
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return super().shouldFlush(record) or record.levelno >= logging.WARNING
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.buffer:
+                sys.stderr.write("".join(f"{self.format(record)}\n" for record in self.buffer))
+                sys.stderr.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+def _configure_logging() -> logging.Handler:
+    """
+    Send agent_farm log records to stderr through a buffer.
+
+    Startup logs a line per extension, config file and macro file; buffering
+    them turns dozens of small stderr writes into one flush at the end of init,
+    where _end_startup_logging replaces the buffer with a plain stream handler.
+    The level comes from AGENT_FARM_LOG (default INFO); WARNING keeps only
+    problems, which is usually enough when stderr is piped through an MCP client.
+    """
+    handler = _BufferedStderrHandler(capacity=1024)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    package_logger = logging.getLogger(__package__ or "agent_farm")
+    package_logger.addHandler(handler)
+    level = (os.environ.get("AGENT_FARM_LOG") or "INFO").strip().upper()
+    try:
+        package_logger.setLevel(level)
+    except ValueError:
+        package_logger.setLevel(logging.INFO)
+        package_logger.warning(f"Unknown AGENT_FARM_LOG level {level!r}, using INFO")
+    return handler
+
+
+def _end_startup_logging(handler: logging.Handler) -> None:
+    """
+    Flush the startup log buffer and log straight to stderr from now on.
+
+    The server runs for a long time after init; records logged while serving
+    must not wait in a buffer for it to fill up.
+    """
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(handler.formatter)
+    package_logger = logging.getLogger(__package__ or "agent_farm")
+    package_logger.addHandler(stream_handler)
+    package_logger.removeHandler(handler)
+    handler.close()
 
 
 def main():
@@ -365,94 +500,92 @@ def main():
     # Get database path from environment or use in-memory
     db_path = os.environ.get("DUCKDB_DATABASE", ":memory:")
 
+    log_handler = _configure_logging()
+
     # Initialize DuckDB connection
     con = duckdb.connect(database=db_path)
-    print(f"Initializing Agent Farm (db: {db_path})...", file=sys.stderr)
+    logger.info(f"Initializing Agent Farm (db: {db_path})...")
 
-    # 1. Load Core Extensions
-    print("Loading extensions...", file=sys.stderr)
-    loaded_extensions = load_core_extensions(con)
+    # 1. Load Core Extensions (startup submodules import meanwhile)
+    logger.info("Loading extensions...")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(_import_startup_modules)
+        loaded_extensions = load_core_extensions(con)
 
     # 2. Initialize Spec Engine (the heart of the system)
-    print("Initializing Spec Engine...", file=sys.stderr)
+    logger.info("Initializing Spec Engine...")
     try:
         from .spec_engine import get_spec_engine, register_spec_engine_tools
 
         spec_engine = get_spec_engine(con)
         spec_tools = register_spec_engine_tools(con)
-        print(f"Spec Engine: Registered {len(spec_tools)} UDFs", file=sys.stderr)
+        logger.info(f"Spec Engine: Registered {len(spec_tools)} UDFs")
     except ImportError as e:
-        print(f"Spec Engine module not available: {e}", file=sys.stderr)
+        logger.warning(f"Spec Engine module not available: {e}")
     except Exception as e:
-        print(f"Error initializing Spec Engine: {e}", file=sys.stderr)
+        logger.error(f"Error initializing Spec Engine: {e}")
 
     # 3. MCP Config Discovery
-    print("Discovering MCP configurations...", file=sys.stderr)
+    logger.info("Discovering MCP configurations...")
     mcp_configs = find_mcp_config()
     mcp_servers = extract_mcp_servers(mcp_configs)
 
-    if mcp_servers:
-        setup_mcp_tables(con, mcp_servers)
-    else:
-        print("No MCP configurations found", file=sys.stderr)
-        con.sql("""
-            CREATE OR REPLACE TABLE mcp_servers (
-                name VARCHAR,
-                command VARCHAR,
-                args VARCHAR[],
-                env JSON,
-                source_config VARCHAR
-            )
-        """)
+    if not mcp_servers:
+        logger.warning("No MCP configurations found")
+    # Always called: it owns the mcp_servers DDL, so an empty dict yields an empty table
+    setup_mcp_tables(con, mcp_servers)
 
     # 4. Register Python UDFs BEFORE SQL macros (macros reference getenv etc.)
     try:
         from .udfs import register_udfs
 
         registered = register_udfs(con)
-        print(f"Registered {len(registered)} UDFs: {', '.join(registered)}", file=sys.stderr)
+        logger.info(f"Registered {len(registered)} UDFs: {', '.join(registered)}")
     except ImportError:
-        print("UDFs module not available, skipping", file=sys.stderr)
+        logger.warning("UDFs module not available, skipping")
     except Exception as e:
-        print(f"Error registering UDFs: {e}", file=sys.stderr)
+        logger.error(f"Error registering UDFs: {e}")
 
-    # 5. Create Agent Infrastructure Tables (workspaces, security_policy, etc.)
+    # 5. Create Agent Infrastructure and Org Tables (workspaces, security_policy, orgs, etc.)
     #    Must exist before SQL macros are loaded, as macros reference these tables.
-    print("Creating agent infrastructure tables...", file=sys.stderr)
-    create_agent_tables(con)
-
     # 6. Create Runtime Tables (sessions, audit, approvals)
-    print("Creating runtime tables...", file=sys.stderr)
-    create_runtime_tables(con)
+    #    Each script runs in its own transaction via execute_sql_script, which
+    #    replays it statement by statement if any DDL fails.
+    try:
+        logger.info("Creating agent infrastructure tables...")
+        create_agent_tables(con)
+        logger.info("Creating runtime tables...")
+        create_runtime_tables(con)
+    except Exception as e:
+        logger.error(f"Error creating agent/runtime tables: {e}")
 
     # 7. Load SQL Macros
-    print("Loading SQL macros...", file=sys.stderr)
+    logger.info("Loading SQL macros...")
     total_macros = load_sql_macros(con)
-    print(f"Total: {total_macros} macros loaded.", file=sys.stderr)
+    logger.info(f"Total: {total_macros} macros loaded.")
 
     # 8. Seed Organization Configurations
     try:
-        from .orgs import generate_org_seed_sql
-
-        org_seed_sql = generate_org_seed_sql()
-        for stmt in org_seed_sql.split(";"):
-            stmt = stmt.strip()
-            if stmt:
-                try:
-                    con.sql(stmt)
-                except Exception as e:
-                    print(f"Error seeding org: {e}", file=sys.stderr)
-        print("Organization configs seeded.", file=sys.stderr)
+        from .orgs import seed_orgs
+
+        con.begin()
+        seeded = seed_orgs(con)
+        con.commit()
+        logger.info(f"Organization configs seeded ({seeded} updated).")
     except ImportError:
-        print("Orgs module not available, skipping seed", file=sys.stderr)
+        logger.warning("Orgs module not available, skipping seed")
     except Exception as e:
-        print(f"Error seeding orgs: {e}", file=sys.stderr)
+        con.rollback()
+        logger.error(f"Error seeding orgs: {e}")
 
     # 9. Create extension info table
-    con.sql(f"""
+    con.execute(
+        """
         CREATE OR REPLACE TABLE loaded_extensions AS
-        SELECT unnest({loaded_extensions!r}::VARCHAR[]) as extension_name
-    """)
+        SELECT unnest(?::VARCHAR[]) as extension_name
+        """,
+        [loaded_extensions],
+    )
 
     # 9. Optionally start HTTP server for Spec Engine
     http_port = os.environ.get("SPEC_ENGINE_HTTP_PORT")
@@ -460,20 +593,27 @@ def main():
     if http_port:
         try:
             port = int(http_port)
+            # Bound, not interpolated: the key comes from the environment verbatim
             if http_api_key:
-                con.sql(f"SELECT httpserve_start('0.0.0.0', {port}, 'X-API-Key {http_api_key}')")
+                con.execute(
+                    "SELECT httpserve_start('0.0.0.0', ?::INTEGER, ?)",
+                    [port, f"X-API-Key {http_api_key}"],
+                )
             else:
-                con.sql(f"SELECT httpserve_start('0.0.0.0', {port})")
-            print(f"Spec Engine HTTP server started on port {port}", file=sys.stderr)
+                con.execute("SELECT httpserve_start('0.0.0.0', ?::INTEGER)", [port])
+            logger.info(f"Spec Engine HTTP server started on port {port}")
         except Exception as e:
-            print(f"Failed to start HTTP server: {e}", file=sys.stderr)
+            logger.error(f"Failed to start HTTP server: {e}")
 
     # 10. Start MCP Server
-    print("Starting MCP Server...", file=sys.stderr)
+    logger.info("Starting MCP Server...")
+    # mcp_server_start blocks serving stdio, so emit the startup log now and
+    # stop buffering for the records logged while serving
+    _end_startup_logging(log_handler)
     try:
         con.sql("SELECT mcp_server_start('stdio', 'localhost', 0, '{}')")
     except Exception as e:
-        print(f"Error starting MCP Server: {e}", file=sys.stderr)
+        logger.error(f"Error starting MCP Server: {e}")
         sys.exit(1)
 
 
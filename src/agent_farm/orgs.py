@@ -4,27 +4,84 @@ Organization configurations for multi-agent system.
 Defines 5 organizations with their models, tools, workspaces, and restrictions.
 """
 
+import functools
+import hashlib
+import sys
+from dataclasses import dataclass, fields
+from typing import NamedTuple
+
+import duckdb
+
 from .schemas import OrgType, SecurityProfile, WorkspaceMode
 
+
+class Workspace(NamedTuple):
+    """A workspace an organization may access."""
+
+    path: str
+    mode: WorkspaceMode
+    name: str
+
+
+class Denial(NamedTuple):
+    """An explicit restriction (shell, workspace, tool or file pattern)."""
+
+    denial_type: str
+    pattern: str
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class OrgConfig:
+    """Static configuration of one organization."""
+
+    id: str
+    name: str
+    description: str
+    model_primary: str
+    model_secondary: str
+    security_profile: SecurityProfile
+    workspaces: tuple[Workspace, ...]
+    tools: tuple[str, ...]
+    tools_requiring_approval: frozenset[str]
+    denials: tuple[Denial, ...]
+    shell_allowlist: tuple[str, ...] = ()
+    searxng_endpoint: str | None = None
+
+    def __post_init__(self) -> None:
+        # Tool names and denial keys recur across orgs; interning them lets
+        # membership and equality checks short-circuit on identity.
+        intern = sys.intern
+        object.__setattr__(self, "tools", tuple(intern(t) for t in self.tools))
+        object.__setattr__(
+            self,
+            "tools_requiring_approval",
+            frozenset(intern(t) for t in self.tools_requiring_approval),
+        )
+        object.__setattr__(
+            self,
+            "denials",
+            tuple(Denial(intern(k), intern(p), r) for k, p, r in self.denials),
+        )
+
+
 # =============================================================================
 # ORGANIZATION CONFIGURATIONS
 # =============================================================================
 
-ORG_CONFIGS = {
+ORG_CONFIGS: dict[OrgType, OrgConfig] = {
     # -------------------------------------------------------------------------
     # DevOrg - Development / Pipelines-as-Code
     # -------------------------------------------------------------------------
-    OrgType.DEV: {
-        "id": "dev-org",
-        "name": "DevOrg",
-        "description": "Development, code reviews, pipeline configurations",
-        "model_primary": "glm-4.7:cloud",
-        "model_secondary": "qwen3-coder:cloud",
-        "security_profile": SecurityProfile.STANDARD,
-        "workspaces": [
-            {"path": "/projects/dev", "mode": WorkspaceMode.WRITER, "name": "Development"},
-        ],
-        "tools": [
+    OrgType.DEV: OrgConfig(
+        id="dev-org",
+        name="DevOrg",
+        description="Development, code reviews, pipeline configurations",
+        model_primary="glm-4.7:cloud",
+        model_secondary="qwen3-coder:cloud",
+        security_profile=SecurityProfile.STANDARD,
+        workspaces=(Workspace("/projects/dev", WorkspaceMode.WRITER, "Development"),),
+        tools=(
             "fs_read",
             "fs_write",
             "fs_list",
@@ -36,30 +93,28 @@ ORG_CONFIGS = {
             "json_transform",
             "dev_validate_config",
             "dev_extract_deps",
-        ],
-        "tools_requiring_approval": ["fs_write", "git_patch"],
-        "denials": [
-            ("shell", "*", "Shell access not allowed for DevOrg"),
-            ("workspace", "/projects/ops/*", "No access to Ops workspace"),
-            ("workspace", "/projects/studio/*", "No access to Studio workspace"),
-            ("tool", "ci_trigger", "CI/CD triggers not allowed"),
-            ("tool", "deploy_service", "Deployments not allowed"),
-        ],
-    },
+        ),
+        tools_requiring_approval=frozenset({"fs_write", "git_patch"}),
+        denials=(
+            Denial("shell", "*", "Shell access not allowed for DevOrg"),
+            Denial("workspace", "/projects/ops/*", "No access to Ops workspace"),
+            Denial("workspace", "/projects/studio/*", "No access to Studio workspace"),
+            Denial("tool", "ci_trigger", "CI/CD triggers not allowed"),
+            Denial("tool", "deploy_service", "Deployments not allowed"),
+        ),
+    ),
     # -------------------------------------------------------------------------
     # OpsOrg - Operations / CI/CD & Render Execution
     # -------------------------------------------------------------------------
-    OrgType.OPS: {
-        "id": "ops-org",
-        "name": "OpsOrg",
-        "description": "CI/CD pipelines, deployments, render jobs",
-        "model_primary": "kimi-k2.5:cloud",
-        "model_secondary": "minimax-m2.1:cloud",
-        "security_profile": SecurityProfile.POWER,
-        "workspaces": [
-            {"path": "/projects/ops", "mode": WorkspaceMode.WRITER, "name": "Operations"},
-        ],
-        "tools": [
+    OrgType.OPS: OrgConfig(
+        id="ops-org",
+        name="OpsOrg",
+        description="CI/CD pipelines, deployments, render jobs",
+        model_primary="kimi-k2.5:cloud",
+        model_secondary="minimax-m2.1:cloud",
+        security_profile=SecurityProfile.POWER,
+        workspaces=(Workspace("/projects/ops", WorkspaceMode.WRITER, "Operations"),),
+        tools=(
             "fs_read",
             "fs_list",
             "ci_trigger",
@@ -73,13 +128,15 @@ ORG_CONFIGS = {
             "ops_add_to_filter",
             "ops_subscribe_ci",
             "ops_publish_status",
-        ],
-        "tools_requiring_approval": [
-            "deploy_service",
-            "rollback_service",
-            "shell_run",
-        ],
-        "shell_allowlist": [
+        ),
+        tools_requiring_approval=frozenset(
+            {
+                "deploy_service",
+                "rollback_service",
+                "shell_run",
+            }
+        ),
+        shell_allowlist=(
             "kubectl",
             "docker",
             "systemctl status",
@@ -87,27 +144,25 @@ ORG_CONFIGS = {
             "df",
             "free",
             "top -b -n 1",
-        ],
-        "denials": [
-            ("workspace", "/projects/dev/*", "No write access to dev repos"),
-            ("tool", "fs_write", "Code changes only via DevOrg"),
-            ("tool", "git_patch", "Code changes only via DevOrg"),
-        ],
-    },
+        ),
+        denials=(
+            Denial("workspace", "/projects/dev/*", "No write access to dev repos"),
+            Denial("tool", "fs_write", "Code changes only via DevOrg"),
+            Denial("tool", "git_patch", "Code changes only via DevOrg"),
+        ),
+    ),
     # -------------------------------------------------------------------------
     # ResearchOrg - Research via SearXNG
     # -------------------------------------------------------------------------
-    OrgType.RESEARCH: {
-        "id": "research-org",
-        "name": "ResearchOrg",
-        "description": "External research, summaries, research notes",
-        "model_primary": "gpt-oss:20b-cloud",
-        "model_secondary": "minimax-m2.1:cloud",
-        "security_profile": SecurityProfile.CONSERVATIVE,
-        "workspaces": [
-            {"path": "/data/research", "mode": WorkspaceMode.WRITER, "name": "Research Notes"},
-        ],
-        "tools": [
+    OrgType.RESEARCH: OrgConfig(
+        id="research-org",
+        name="ResearchOrg",
+        description="External research, summaries, research notes",
+        model_primary="gpt-oss:20b-cloud",
+        model_secondary="minimax-m2.1:cloud",
+        security_profile=SecurityProfile.CONSERVATIVE,
+        workspaces=(Workspace("/data/research", WorkspaceMode.WRITER, "Research Notes"),),
+        tools=(
             "searxng_search",
             "fs_read",
             "fs_write_note",
@@ -123,31 +178,29 @@ ORG_CONFIGS = {
             "research_minhash_signature",
             "research_index_doc",
             "research_find_similar_docs",
-        ],
-        "tools_requiring_approval": [],
-        "searxng_endpoint": "http://searxng:8080",
-        "denials": [
-            ("tool", "fetch", "Direct HTTP access not allowed"),
-            ("tool", "fetch_url", "Direct HTTP access not allowed"),
-            ("tool", "shell_run", "Shell access not allowed"),
-            ("tool", "deploy_service", "Deployments not allowed"),
-            ("workspace", "/projects/*", "No access to project workspaces"),
-        ],
-    },
+        ),
+        tools_requiring_approval=frozenset(),
+        searxng_endpoint="http://searxng:8080",
+        denials=(
+            Denial("tool", "fetch", "Direct HTTP access not allowed"),
+            Denial("tool", "fetch_url", "Direct HTTP access not allowed"),
+            Denial("tool", "shell_run", "Shell access not allowed"),
+            Denial("tool", "deploy_service", "Deployments not allowed"),
+            Denial("workspace", "/projects/*", "No access to project workspaces"),
+        ),
+    ),
     # -------------------------------------------------------------------------
     # StudioOrg - Product / Creative / DCC Briefings
     # -------------------------------------------------------------------------
-    OrgType.STUDIO: {
-        "id": "studio-org",
-        "name": "StudioOrg",
-        "description": "Requirements, specs, DCC briefings, shot notes",
-        "model_primary": "kimi-k2.5:cloud",
-        "model_secondary": "gemma3:4b-cloud",
-        "security_profile": SecurityProfile.STANDARD,
-        "workspaces": [
-            {"path": "/projects/studio", "mode": WorkspaceMode.WRITER, "name": "Studio"},
-        ],
-        "tools": [
+    OrgType.STUDIO: OrgConfig(
+        id="studio-org",
+        name="StudioOrg",
+        description="Requirements, specs, DCC briefings, shot notes",
+        model_primary="kimi-k2.5:cloud",
+        model_secondary="gemma3:4b-cloud",
+        security_profile=SecurityProfile.STANDARD,
+        workspaces=(Workspace("/projects/studio", WorkspaceMode.WRITER, "Studio"),),
+        tools=(
             "fs_read",
             "fs_write",
             "fs_list",
@@ -159,31 +212,31 @@ ORG_CONFIGS = {
             "studio_find_similar",
             "studio_asset_order",
             "studio_collab_event",
-        ],
-        "tools_requiring_approval": [],
-        "denials": [
-            ("workspace", "/projects/dev/*", "No access to Dev workspace"),
-            ("workspace", "/projects/ops/*", "No access to Ops workspace"),
-            ("tool", "shell_run", "Shell access not allowed"),
-            ("tool", "ci_trigger", "CI/CD not allowed"),
-            ("tool", "deploy_service", "Deployments not allowed"),
-            ("pattern", "*.py", "Cannot edit Python files"),
-            ("pattern", "*.sh", "Cannot edit shell scripts"),
-            ("pattern", "*.yaml", "Cannot edit pipeline configs"),
-        ],
-    },
+        ),
+        tools_requiring_approval=frozenset(),
+        denials=(
+            Denial("workspace", "/projects/dev/*", "No access to Dev workspace"),
+            Denial("workspace", "/projects/ops/*", "No access to Ops workspace"),
+            Denial("tool", "shell_run", "Shell access not allowed"),
+            Denial("tool", "ci_trigger", "CI/CD not allowed"),
+            Denial("tool", "deploy_service", "Deployments not allowed"),
+            Denial("pattern", "*.py", "Cannot edit Python files"),
+            Denial("pattern", "*.sh", "Cannot edit shell scripts"),
+            Denial("pattern", "*.yaml", "Cannot edit pipeline configs"),
+        ),
+    ),
     # -------------------------------------------------------------------------
     # OrchestratorOrg - Central Coordination
     # -------------------------------------------------------------------------
-    OrgType.ORCHESTRATOR: {
-        "id": "orchestrator-org",
-        "name": "OrchestratorOrg",
-        "description": "Central task distribution to orgs",
-        "model_primary": "kimi-k2.5:cloud",
-        "model_secondary": "glm-4.7:cloud",
-        "security_profile": SecurityProfile.CONSERVATIVE,
-        "workspaces": [],  # No direct workspace access
-        "tools": [
+    OrgType.ORCHESTRATOR: OrgConfig(
+        id="orchestrator-org",
+        name="OrchestratorOrg",
+        description="Central task distribution to orgs",
+        model_primary="kimi-k2.5:cloud",
+        model_secondary="glm-4.7:cloud",
+        security_profile=SecurityProfile.CONSERVATIVE,
+        workspaces=(),  # No direct workspace access
+        tools=(
             "call_dev_org",
             "call_ops_org",
             "call_research_org",
@@ -196,15 +249,15 @@ ORG_CONFIGS = {
             "orchestrator_listen",
             "orchestrator_subscribe",
             "smart_route",
-        ],
-        "tools_requiring_approval": [],
-        "denials": [
-            ("tool", "fs_read", "No direct file access"),
-            ("tool", "fs_write", "No direct file access"),
-            ("tool", "shell_run", "No shell access"),
-            ("tool", "fetch", "No web access"),
-        ],
-    },
+        ),
+        tools_requiring_approval=frozenset(),
+        denials=(
+            Denial("tool", "fs_read", "No direct file access"),
+            Denial("tool", "fs_write", "No direct file access"),
+            Denial("tool", "shell_run", "No shell access"),
+            Denial("tool", "fetch", "No web access"),
+        ),
+    ),
 }
 
 # =============================================================================
@@ -365,64 +418,166 @@ ALWAYS delegate to the appropriate org. NEVER execute yourself.""",
 }
 
 
-def get_org_config(org_type: OrgType) -> dict:
+# Lookup tables keyed by both the OrgType member and its interned value, so
+# callers holding a raw string ("dev") resolve in the same single dict probe.
+# Member keys are kept because Enum.value is a descriptor call and costs more
+# than the member hash it would replace.
+_ORG_CONFIG_LOOKUP = {**ORG_CONFIGS, **{sys.intern(k.value): v for k, v in ORG_CONFIGS.items()}}
+_ORG_PROMPT_LOOKUP = {
+    **ORG_SYSTEM_PROMPTS,
+    **{sys.intern(k.value): v for k, v in ORG_SYSTEM_PROMPTS.items()},
+}
+
+
+def get_org_config(org_type: OrgType | str) -> OrgConfig | None:
     """Get configuration for an organization."""
-    return ORG_CONFIGS.get(org_type, {})
+    return _ORG_CONFIG_LOOKUP.get(org_type)
 
 
-def get_org_prompt(org_type: OrgType) -> str:
+def get_org_prompt(org_type: OrgType | str) -> str:
     """Get system prompt for an organization."""
-    return ORG_SYSTEM_PROMPTS.get(org_type, "")
+    return _ORG_PROMPT_LOOKUP.get(org_type, "")
+
 
+# ORG_CONFIGS is fixed at import time, so the id list is built once
+_ALL_ORG_IDS = tuple(cfg.id for cfg in ORG_CONFIGS.values())
 
-def get_all_org_ids() -> list[str]:
+
+def get_all_org_ids() -> tuple[str, ...]:
     """Get all organization IDs."""
-    return [cfg["id"] for cfg in ORG_CONFIGS.values()]
-
-
-# SQL to seed org configurations
-def generate_org_seed_sql() -> str:
-    """Generate SQL to seed organization configurations."""
-    statements = []
-
-    for org_type, config in ORG_CONFIGS.items():
-        prompt = ORG_SYSTEM_PROMPTS.get(org_type, "").replace("'", "''")
-        desc = config.get("description", "").replace("'", "''")
-
-        statements.append(f"""
-INSERT INTO orgs (id, name, org_type, description, model_primary, model_secondary, system_prompt)
-VALUES (
-    '{config["id"]}',
-    '{config["name"]}',
-    '{org_type.value}',
-    '{desc}',
-    '{config["model_primary"]}',
-    '{config.get("model_secondary", "")}',
-    '{prompt}'
-) ON CONFLICT (id) DO UPDATE SET
+    return _ALL_ORG_IDS
+
+
+# SQL to seed org configurations. Each statement binds one list per column and
+# lets DuckDB UNNEST them back into rows, so values are never spliced into SQL.
+_SEED_ORGS_SQL = """
+INSERT INTO orgs (
+    id, name, org_type, description, model_primary, model_secondary, system_prompt, config_hash
+)
+SELECT
+    UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]),
+    UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[])
+ON CONFLICT (id) DO UPDATE SET
     model_primary = EXCLUDED.model_primary,
     model_secondary = EXCLUDED.model_secondary,
-    system_prompt = EXCLUDED.system_prompt;
-""")
+    system_prompt = EXCLUDED.system_prompt,
+    config_hash = EXCLUDED.config_hash
+"""
 
-        # Tool permissions
-        for tool in config.get("tools", []):
-            req_approval = tool in config.get("tools_requiring_approval", [])
-            statements.append(f"""
+_SEED_TOOLS_SQL = """
 INSERT INTO org_tools (org_id, tool_name, enabled, requires_approval)
-VALUES ('{config["id"]}', '{tool}', TRUE, {str(req_approval).upper()})
+SELECT UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), TRUE, UNNEST(?::BOOLEAN[])
 ON CONFLICT (org_id, tool_name) DO UPDATE SET
-    enabled = TRUE, requires_approval = {str(req_approval).upper()};
-""")
+    enabled = TRUE, requires_approval = EXCLUDED.requires_approval
+"""
 
-        # Denials
-        for denial in config.get("denials", []):
-            denial_type, pattern, reason = denial
-            reason_escaped = reason.replace("'", "''")
-            statements.append(f"""
+_SEED_DENIALS_SQL = """
 INSERT INTO org_denials (org_id, denial_type, pattern, reason)
-VALUES ('{config["id"]}', '{denial_type}', '{pattern}', '{reason_escaped}')
-ON CONFLICT (org_id, denial_type, pattern) DO NOTHING;
-""")
+SELECT UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[])
+ON CONFLICT (org_id, denial_type, pattern) DO NOTHING
+"""
+
+_SEEDED_HASHES_SQL = "SELECT id, config_hash FROM orgs WHERE id = ANY(?::VARCHAR[])"
+
+
+def _config_hash(org_type: OrgType, config: OrgConfig) -> str:
+    """Digest of everything seeded for one org (config, tools, denials, prompt)."""
+    state = {f.name: getattr(config, f.name) for f in fields(config)}
+    # frozenset repr order follows per-process str hashing; sort for a stable digest
+    state["tools_requiring_approval"] = sorted(config.tools_requiring_approval)
+    payload = repr((state, ORG_SYSTEM_PROMPTS.get(org_type, ""))).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+# Seeded alongside each org row, so unchanged orgs can be skipped on restart
+_ORG_CONFIG_HASHES = {cfg.id: _config_hash(t, cfg) for t, cfg in ORG_CONFIGS.items()}
+
 
-    return "\n".join(statements)
+def _columns(rows: list[tuple], width: int) -> list[list]:
+    """Transpose rows into one list per column."""
+    if not rows:
+        return [[] for _ in range(width)]
+    return [list(column) for column in zip(*rows)]
+
+
+def _build_seed_statements(org_types: list[OrgType]) -> list[tuple[str, list[list]]]:
+    """Build the (sql, params) upserts for the given organizations."""
+    org_rows = []
+    tool_rows = []
+    denial_rows = []
+
+    for org_type in org_types:
+        config = ORG_CONFIGS[org_type]
+        org_rows.append(
+            (
+                config.id,
+                config.name,
+                org_type.value,
+                config.description,
+                config.model_primary,
+                config.model_secondary,
+                ORG_SYSTEM_PROMPTS.get(org_type, ""),
+                _ORG_CONFIG_HASHES[config.id],
+            )
+        )
+
+        # Tool permissions
+        tool_rows.extend(
+            (config.id, tool, tool in config.tools_requiring_approval) for tool in config.tools
+        )
+
+        # Denials
+        denial_rows.extend((config.id, *denial) for denial in config.denials)
+
+    return [
+        (_SEED_ORGS_SQL, _columns(org_rows, 8)),
+        (_SEED_TOOLS_SQL, _columns(tool_rows, 3)),
+        (_SEED_DENIALS_SQL, _columns(denial_rows, 4)),
+    ]
+
+
+@functools.cache
+def generate_org_seed_sql() -> list[tuple[str, list[list]]]:
+    """
+    Generate parameterized statements to seed organization configurations.
+
+    ORG_CONFIGS and ORG_SYSTEM_PROMPTS are constants, so the statements are
+    built once per process and the same list is returned to later callers
+    (re-seeding, tests); treat it as read-only.
+
+    Returns:
+        (sql, params) pairs for con.execute(sql, params): one upsert each for
+        orgs, org_tools and org_denials, with params holding one list per column.
+    """
+    return _build_seed_statements(list(ORG_CONFIGS))
+
+
+def seed_orgs(con: duckdb.DuckDBPyConnection) -> int:
+    """
+    Upsert organization configurations whose stored config_hash is out of date.
+
+    On a persistent database with unchanged configs this is a single SELECT.
+    DuckDB's Python API has no reusable prepared-statement handle, and
+    executemany re-binds per row; one columnar statement per table is the
+    cheapest repeatable form. Callers own the surrounding transaction.
+
+    Args:
+        con: Connection with the org tables created (schemas.ORG_TABLES_SQL)
+
+    Returns:
+        Number of organizations written
+    """
+    seeded = dict(con.execute(_SEEDED_HASHES_SQL, [list(_ORG_CONFIG_HASHES)]).fetchall())
+    changed = [
+        t for t, cfg in ORG_CONFIGS.items() if seeded.get(cfg.id) != _ORG_CONFIG_HASHES[cfg.id]
+    ]
+    if not changed:
+        return 0
+
+    if len(changed) == len(ORG_CONFIGS):
+        statements = generate_org_seed_sql()
+    else:
+        statements = _build_seed_statements(changed)
+    for sql, params in statements:
+        con.execute(sql, params)
+    return len(changed)
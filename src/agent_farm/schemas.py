@@ -5,10 +5,10 @@ These are simple data structures for config - the actual logic
 lives in SQL macros and DuckDB tables.
 """
 
-from enum import Enum
+from enum import StrEnum
 
 
-class AgentRole(str, Enum):
+class AgentRole(StrEnum):
     CODE = "code"
     RESEARCH = "research"
     ORGANIZER = "organizer"
@@ -21,7 +21,7 @@ class AgentRole(str, Enum):
     ORCHESTRATOR = "orchestrator"
 
 
-class OrgType(str, Enum):
+class OrgType(StrEnum):
     """Organization types for multi-agent system."""
 
     DEV = "dev"  # Development / Pipelines-as-Code
@@ -31,19 +31,19 @@ class OrgType(str, Enum):
     ORCHESTRATOR = "orchestrator"  # Zentrale Steuerung
 
 
-class WorkspaceMode(str, Enum):
+class WorkspaceMode(StrEnum):
     READ_ONLY = "readOnly"
     WRITER = "writer"
     OPERATOR = "operator"
 
 
-class SecurityProfile(str, Enum):
+class SecurityProfile(StrEnum):
     CONSERVATIVE = "conservative"
     STANDARD = "standard"
     POWER = "power"
 
 
-class ModelBackend(str, Enum):
+class ModelBackend(StrEnum):
     CLAUDE_CLOUD = "claude_cloud"
     OLLAMA_LOCAL = "ollama_local"
 
@@ -168,9 +168,13 @@ CREATE TABLE IF NOT EXISTS orgs (
     model_secondary VARCHAR,
     system_prompt TEXT NOT NULL,
     enabled BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP DEFAULT now()
+    created_at TIMESTAMP DEFAULT now(),
+    config_hash VARCHAR
 );
 
+-- Databases created before config_hash was added
+ALTER TABLE orgs ADD COLUMN IF NOT EXISTS config_hash VARCHAR;
+
 -- Organization allowed tools
 CREATE TABLE IF NOT EXISTS org_tools (
     org_id VARCHAR NOT NULL,
@@ -202,3 +206,6 @@ CREATE TABLE IF NOT EXISTS org_calls (
     completed_at TIMESTAMP
 );
 """
+
+# All bootstrap DDL in one script, so startup parses and runs it in a single call
+ALL_TABLES_SQL = AGENT_TABLES_SQL + ORG_TABLES_SQL
@@ -18,14 +18,132 @@ MCP Tools exposed:
 - mcp_call_remote_tool: Call remote MCP tools
 """
 
-import json
+import functools
+import logging
+import math
 import os
-import sys
+import queue
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
 import duckdb
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import _json
+from .extensions import install_and_load_extensions
+
+logger = logging.getLogger(__name__)
+
+# ID sequence per table (sql/spec/schema.sql and intelligence.sql); inserts take
+# IDs from nextval()
+_ID_SEQUENCES = {
+    "spec_objects": "spec_objects_seq",
+    "spec_docs": "spec_docs_seq",
+    "spec_payloads": "spec_payloads_seq",
+    "spec_relationships": "spec_relationships_seq",
+    "spec_feedback": "spec_feedback_seq",
+    "spec_adaptations": "spec_adaptations_seq",
+    "spec_learning": "spec_learning_seq",
+    "spec_embeddings": "spec_embeddings_seq",
+    "memory_conversations": "memory_conversations_seq",
+    "knowledge_dev": "knowledge_dev_seq",
+    "knowledge_research": "knowledge_research_seq",
+    "knowledge_studio": "knowledge_studio_seq",
+    "knowledge_ops": "knowledge_ops_seq",
+}
+
+# Full spec row for spec_get; timestamps are cast to text in SQL
+_SPEC_GET_SELECT = """
+    SELECT
+        o.id, o.kind, o.name, o.version, o.status, o.summary,
+        o.created_at::VARCHAR, o.updated_at::VARCHAR,
+        d.doc,
+        p.payload,
+        p.schema_ref
+    FROM spec_objects o
+    LEFT JOIN spec_docs d ON d.object_id = o.id
+    LEFT JOIN spec_payloads p ON p.object_id = o.id
+"""
+
+# Maximum number of search_similar/hybrid_search results kept per engine
+_SEARCH_CACHE_SIZE = 1024
+
+# Row shape shared by spec_list and spec_search
+_SPEC_SUMMARY_COLUMNS = ("id", "kind", "name", "version", "status", "summary")
+
+
+def _iter_rows(result: duckdb.DuckDBPyConnection, arraysize: int = 256) -> Iterator[tuple]:
+    """
+    Yield the rows of an executed query in fetchmany() batches.
+
+    Only one batch of row tuples is alive at a time, instead of the full
+    fetchall() list next to the list of dicts built from it.
+    """
+    while rows := result.fetchmany(arraysize):
+        yield from rows
+
+
+# Cosine similarity against the bound, unit-length $embedding. store_embedding
+# stores unit vectors, for which cosine is just the inner product; rows stored
+# before that (embedding_normalized false) still go through the full cosine.
+_SIMILARITY_SQL = """CASE WHEN embedding_normalized
+                THEN list_inner_product(embedding, $embedding::FLOAT[])
+                ELSE list_cosine_similarity(embedding, $embedding::FLOAT[]) END"""
+
+
+def _unit_vector(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length; a zero vector is returned unchanged."""
+    norm = math.hypot(*vector)
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+# One pass over spec_embeddings scores both signals per row; every input is a
+# bound parameter, so the statement text never changes.
+_HYBRID_SEARCH_SQL = f"""
+    SELECT
+        id, spec_id, org_id, content_type, content, metadata,
+        keyword_score, COALESCE(vector_score, 0) AS vector_score,
+        keyword_score * $keyword_weight
+            + COALESCE(vector_score, 0) * (1.0 - $keyword_weight) AS hybrid_score
+    FROM (
+        SELECT
+            id, spec_id, org_id, content_type, content, metadata,
+            CASE WHEN lower(content) LIKE '%' || lower($text) || '%'
+                 THEN 1.0 ELSE 0.0 END AS keyword_score,
+            {_SIMILARITY_SQL} AS vector_score
+        FROM spec_embeddings
+        WHERE $content_type IS NULL OR content_type = $content_type
+    )
+    WHERE vector_score IS NOT NULL OR keyword_score > 0
+    ORDER BY hybrid_score DESC
+    LIMIT $k
+"""
+
+
+def _serialized_write(method: Callable) -> Callable:
+    """
+    Run a SpecEngine method under the engine's write lock.
+
+    Every write goes through self.con, whose transaction state is shared by all
+    threads; the lock keeps one caller's transaction from interleaving with
+    another's statements. It is reentrant, so writers can call each other.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "SpecEngine", *args: Any, **kwargs: Any) -> Any:
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class SpecEngine:
     """
@@ -44,7 +162,30 @@ class SpecEngine:
         self.con = con
         self.db_path = db_path or os.environ.get("SPEC_ENGINE_DB", "db/spec_engine.db")
         self._initialized = False
-
+        # Active template source by name; cleared by spec_create/update/delete and
+        # _check_specs_version
+        self._template_cache: dict[str, str] = {}
+        # (kind, name) -> (schema name, schema JSON) for validation; cleared likewise
+        self._schema_cache: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+        # (row counts, max ids, latest update) of the spec tables when the template
+        # and schema caches were last valid
+        self._specs_version: tuple | None = None
+        # Embedding search results, least recently used first; cleared by
+        # _embeddings_changed
+        self._search_cache: OrderedDict[tuple, list[dict[str, Any]]] = OrderedDict()
+        # (row count, max id) of spec_embeddings when the derived state was last valid
+        self._embeddings_version: tuple | None = None
+        # (ids, content types, unit-length matrix, row count) of spec_embeddings for
+        # the NumPy search_similar path; the arrays are buffers with spare rows past
+        # the row count, and matrix is None when dimensions differ. Updated by
+        # store_embedding, reset by _embeddings_changed
+        self._embedding_matrix: tuple | None = None
+        # Idle cursors for read queries; grows to the number of concurrent readers
+        self._cursors: queue.SimpleQueue[duckdb.DuckDBPyConnection] = queue.SimpleQueue()
+        # Held around every write on self.con (see _serialized_write)
+        self._write_lock = threading.RLock()
+
+    @_serialized_write
     def initialize(self) -> None:
         """
         Initialize the Spec Engine database, loading extensions, schema, macros, and seed data.
@@ -52,7 +193,7 @@ class SpecEngine:
         if self._initialized:
             return
 
-        print("Initializing Spec Engine...", file=sys.stderr)
+        logger.info("Initializing Spec Engine...")
 
         # Load extensions
         self._load_extensions()
@@ -66,8 +207,11 @@ class SpecEngine:
         # Load seed data (if tables are empty)
         self._load_seed_data()
 
+        # Seed rows carry explicit IDs; move the ID sequences past them
+        self._sync_id_sequences()
+
         self._initialized = True
-        print("Spec Engine initialized successfully.", file=sys.stderr)
+        logger.info("Spec Engine initialized successfully.")
 
     def _load_extensions(self) -> None:
         """Load required DuckDB extensions."""
@@ -81,23 +225,18 @@ class SpecEngine:
             ("http_client", False),  # HTTP client
         ]
 
-        for ext, required in extensions:
-            try:
-                # Try standard install first
-                self.con.sql(f"INSTALL {ext};")
-                self.con.sql(f"LOAD {ext};")
-                print(f"Spec Engine: Loaded {ext}", file=sys.stderr)
-            except Exception:
-                try:
-                    # Try community install
-                    self.con.sql(f"INSTALL {ext} FROM community;")
-                    self.con.sql(f"LOAD {ext};")
-                    print(f"Spec Engine: Loaded {ext} from community", file=sys.stderr)
-                except Exception as e:
-                    if required:
-                        print(f"Spec Engine: REQUIRED extension {ext} failed: {e}", file=sys.stderr)
-                    else:
-                        print(f"Spec Engine: Optional extension {ext} skipped: {e}", file=sys.stderr)
+        required_exts = {ext for ext, required in extensions if required}
+        results = install_and_load_extensions(self.con, [ext for ext, _ in extensions])
+        for ext, source, error in results:
+            if error is None:
+                if source == "community":
+                    logger.info(f"Spec Engine: Loaded {ext} from community")
+                else:
+                    logger.info(f"Spec Engine: Loaded {ext}")
+            elif ext in required_exts:
+                logger.error(f"Spec Engine: REQUIRED extension {ext} failed: {error}")
+            else:
+                logger.warning(f"Spec Engine: Optional extension {ext} skipped: {error}")
 
     def _has_non_comment_content(self, stmt: str) -> bool:
         """Check if a SQL statement has any non-comment content."""
@@ -108,70 +247,95 @@ class SpecEngine:
         return False
 
     def _load_sql_file(self, filepath: str) -> int:
-        """Load and execute a SQL file, returning number of statements executed."""
+        """
+        Load and execute a SQL file, returning number of statements executed.
+
+        The file runs as one script in a single transaction. If any statement
+        fails it is rolled back and replayed statement by statement, so the
+        failing statements are logged individually and the rest still apply.
+        """
         if not os.path.exists(filepath):
-            print(f"Spec Engine: SQL file not found: {filepath}", file=sys.stderr)
+            logger.warning(f"Spec Engine: SQL file not found: {filepath}")
             return 0
 
         with open(filepath, "r", encoding="utf-8") as f:
             sql_content = f.read()
 
-        # Split into statements
+        # Split into statements (already stripped, comment-only chunks dropped)
         statements = self._split_sql(sql_content)
+
+        try:
+            self.con.begin()
+            self.con.execute(sql_content)
+            self.con.commit()
+            return len(statements)
+        except Exception as e:
+            self.con.rollback()
+            logger.debug(f"Spec Engine: {filepath} failed as one script, retrying: {e}")
+
         executed = 0
 
         for stmt in statements:
-            stmt = stmt.strip()
-            # Check for non-comment content (handles statements starting with comments)
-            if not self._has_non_comment_content(stmt):
-                continue
             try:
                 self.con.sql(stmt)
                 executed += 1
             except Exception as e:
-                print(f"Spec Engine: Error in {filepath}: {e}", file=sys.stderr)
-                print(f"  Statement: {stmt[:100]}...", file=sys.stderr)
+                logger.error(f"Spec Engine: Error in {filepath}: {e}")
+                logger.error(f"  Statement: {stmt[:100]}...")
 
         return executed
 
     def _split_sql(self, sql_content: str) -> list[str]:
-        """Split SQL content into statements, respecting string literals."""
+        """
+        Split SQL content into statements using DuckDB's own parser.
+
+        Falls back to _scan_sql when the content does not parse as a whole, e.g.
+        when it uses syntax from an extension that is not loaded.
+        """
+        try:
+            return [stmt.query.strip() for stmt in self.con.extract_statements(sql_content)]
+        except Exception:
+            return self._scan_sql(sql_content)
+
+    def _scan_sql(self, sql_content: str) -> list[str]:
+        """Split SQL content into statements, respecting string literals and comments."""
         statements = []
-        current = []
-        in_string = False
-        string_char = None
+        stmt_start = 0
+        length = len(sql_content)
 
         i = 0
-        while i < len(sql_content):
+        while i < length:
             char = sql_content[i]
 
-            if char in ("'", '"') and not in_string:
-                in_string = True
-                string_char = char
-                current.append(char)
-            elif char == string_char and in_string:
-                if i + 1 < len(sql_content) and sql_content[i + 1] == string_char:
-                    current.append(char)
-                    current.append(char)
-                    i += 1
-                else:
-                    in_string = False
-                    string_char = None
-                    current.append(char)
-            elif char == ";" and not in_string:
-                stmt = "".join(current).strip()
+            if char in ("'", '"'):
+                # Jump straight to the closing quote; a doubled quote is an escape
+                end = sql_content.find(char, i + 1)
+                while end != -1 and sql_content.startswith(char, end + 1):
+                    end = sql_content.find(char, end + 2)
+                if end == -1:
+                    # Unterminated literal runs to the end of the input
+                    break
+                i = end + 1
+                continue
+            if char == "-" and sql_content.startswith("-", i + 1):
+                # Line comment: quotes inside it (e.g. "org's") open no literal
+                end = sql_content.find("\n", i + 2)
+                if end == -1:
+                    break
+                i = end + 1
+                continue
+            if char == ";":
+                # Slice the statement out of the source instead of rebuilding it
+                stmt = sql_content[stmt_start:i].strip()
                 # Use _has_non_comment_content to properly check for real SQL
                 if stmt and self._has_non_comment_content(stmt):
                     statements.append(stmt)
-                current = []
-            else:
-                current.append(char)
+                stmt_start = i + 1
             i += 1
 
-        if current:
-            stmt = "".join(current).strip()
-            if stmt and self._has_non_comment_content(stmt):
-                statements.append(stmt)
+        stmt = sql_content[stmt_start:].strip()
+        if stmt and self._has_non_comment_content(stmt):
+            statements.append(stmt)
 
         return statements
 
@@ -182,13 +346,13 @@ class SpecEngine:
         # Core schema
         schema_path = db_dir / "schema.sql"
         count = self._load_sql_file(str(schema_path))
-        print(f"Spec Engine: Loaded schema ({count} statements)", file=sys.stderr)
+        logger.info(f"Spec Engine: Loaded schema ({count} statements)")
 
         # Intelligence layer (embeddings, knowledge bases)
         intel_path = db_dir / "intelligence.sql"
         if intel_path.exists():
             intel_count = self._load_sql_file(str(intel_path))
-            print(f"Spec Engine: Loaded intelligence layer ({intel_count} statements)", file=sys.stderr)
+            logger.info(f"Spec Engine: Loaded intelligence layer ({intel_count} statements)")
 
     def _load_macros(self) -> None:
         """Load the Spec Engine macros including RAG macros."""
@@ -197,20 +361,20 @@ class SpecEngine:
         # Core macros
         macros_path = db_dir / "macros.sql"
         count = self._load_sql_file(str(macros_path))
-        print(f"Spec Engine: Loaded macros ({count} macros)", file=sys.stderr)
+        logger.info(f"Spec Engine: Loaded macros ({count} macros)")
 
         # RAG/hybrid search macros
         rag_path = db_dir / "rag.sql"
         if rag_path.exists():
             rag_count = self._load_sql_file(str(rag_path))
-            print(f"Spec Engine: Loaded RAG macros ({rag_count} macros)", file=sys.stderr)
+            logger.info(f"Spec Engine: Loaded RAG macros ({rag_count} macros)")
 
     def _load_seed_data(self) -> None:
         """Load seed data if tables are empty."""
         try:
-            result = self.con.sql("SELECT COUNT(*) FROM spec_objects").fetchone()
-            if result and result[0] > 0:
-                print(f"Spec Engine: {result[0]} specs already exist, skipping seed", file=sys.stderr)
+            # Existence probe: stops at the first row instead of counting them all
+            if self.con.sql("SELECT 1 FROM spec_objects LIMIT 1").fetchone():
+                logger.info("Spec Engine: Specs already exist, skipping seed")
                 return
         except Exception:
             pass  # Table might not exist yet
@@ -218,7 +382,17 @@ class SpecEngine:
         db_dir = Path(__file__).parent / "sql" / "spec"
         seed_path = db_dir / "seed.sql"
         count = self._load_sql_file(str(seed_path))
-        print(f"Spec Engine: Loaded seed data ({count} statements)", file=sys.stderr)
+        logger.info(f"Spec Engine: Loaded seed data ({count} statements)")
+
+    def _sync_id_sequences(self) -> None:
+        """Restart each ID sequence after the largest ID already in its table."""
+        for table, sequence in _ID_SEQUENCES.items():
+            try:
+                max_id = self.con.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                # DDL takes no parameters; max_id is an integer read back from the table
+                self.con.execute(f"CREATE OR REPLACE SEQUENCE {sequence} START {max_id + 1}")
+            except Exception as e:
+                logger.warning(f"Spec Engine: Could not sync {sequence}: {e}")
 
     # =========================================================================
     # MCP Tool Implementations
@@ -254,9 +428,8 @@ class SpecEngine:
         query += " ORDER BY kind, name, version DESC LIMIT ?"
         params.append(limit)
 
-        result = self.con.execute(query, params).fetchall()
-        columns = ["id", "kind", "name", "version", "status", "summary"]
-        return [dict(zip(columns, row)) for row in result]
+        result = self._read_rows(query, params)
+        return [dict(zip(_SPEC_SUMMARY_COLUMNS, row)) for row in result]
 
     def spec_get(
         self,
@@ -278,32 +451,10 @@ class SpecEngine:
             Full spec object with id, kind, name, version, status, summary, doc, payload, schema_ref
         """
         if id is not None:
-            query = """
-                SELECT
-                    o.id, o.kind, o.name, o.version, o.status, o.summary,
-                    o.created_at, o.updated_at,
-                    d.doc,
-                    p.payload,
-                    p.schema_ref
-                FROM spec_objects o
-                LEFT JOIN spec_docs d ON d.object_id = o.id
-                LEFT JOIN spec_payloads p ON p.object_id = o.id
-                WHERE o.id = ?
-            """
-            result = self.con.execute(query, [id]).fetchone()
+            query = _SPEC_GET_SELECT + " WHERE o.id = ?"
+            result = self._read_one(query, [id])
         elif kind and name:
-            query = """
-                SELECT
-                    o.id, o.kind, o.name, o.version, o.status, o.summary,
-                    o.created_at, o.updated_at,
-                    d.doc,
-                    p.payload,
-                    p.schema_ref
-                FROM spec_objects o
-                LEFT JOIN spec_docs d ON d.object_id = o.id
-                LEFT JOIN spec_payloads p ON p.object_id = o.id
-                WHERE o.kind = ? AND o.name = ?
-            """
+            query = _SPEC_GET_SELECT + " WHERE o.kind = ? AND o.name = ?"
             params = [kind, name]
             if version:
                 query += " AND o.version = ?"
@@ -311,7 +462,7 @@ class SpecEngine:
             else:
                 query += " ORDER BY o.version DESC"
             query += " LIMIT 1"
-            result = self.con.execute(query, params).fetchone()
+            result = self._read_one(query, params)
         else:
             return None
 
@@ -327,21 +478,19 @@ class SpecEngine:
         # Parse JSON payload if it's a string
         if spec.get("payload") and isinstance(spec["payload"], str):
             try:
-                spec["payload"] = json.loads(spec["payload"])
-            except json.JSONDecodeError:
+                spec["payload"] = _json.loads(spec["payload"])
+            except _json.JSONDecodeError:
                 pass
 
-        # Convert timestamps to strings
-        for ts_field in ["created_at", "updated_at"]:
-            if spec.get(ts_field):
-                spec[ts_field] = str(spec[ts_field])
-
         return spec
 
     def spec_search(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
         """
         Search specs by query string.
 
+        Specs match on a case-insensitive substring of their name, summary or
+        docs, so partial words match too.
+
         Args:
             query: Search query (searches name, summary, and docs)
             limit: Maximum number of results
@@ -361,13 +510,9 @@ class SpecEngine:
                 o.kind, o.name
             LIMIT ?
         """
-        result = self.con.execute(
-            search_query,
-            [query, query, query, query, limit]
-        ).fetchall()
+        result = self._read_rows(search_query, [query, query, query, query, limit])
 
-        columns = ["id", "kind", "name", "version", "status", "summary"]
-        return [dict(zip(columns, row)) for row in result]
+        return [dict(zip(_SPEC_SUMMARY_COLUMNS, row)) for row in result]
 
     def render_from_template(
         self,
@@ -385,28 +530,18 @@ class SpecEngine:
             Dict with 'rendered' key containing the rendered string
         """
         try:
-            # Get the template from spec_payloads
-            template_query = """
-                SELECT p.payload->>'template'
-                FROM spec_objects o
-                JOIN spec_payloads p ON p.object_id = o.id
-                WHERE o.kind IN ('task_template', 'prompt_template')
-                  AND o.name = ?
-                  AND o.status = 'active'
-                ORDER BY o.version DESC
-                LIMIT 1
-            """
-            result = self.con.execute(template_query, [template_name]).fetchone()
-
-            if not result or not result[0]:
-                return {"error": f"Template '{template_name}' not found", "rendered": None}
-
-            template_str = result[0]
+            self._check_specs_version()
+            template_str = self._template_cache.get(template_name)
+            if template_str is None:
+                template_str = self._fetch_template(template_name)
+                if template_str is None:
+                    return {"error": f"Template '{template_name}' not found", "rendered": None}
+                self._template_cache[template_name] = template_str
 
             # Render using minijinja
             render_query = "SELECT minijinja_render(?, ?)"
-            context_json = json.dumps(context)
-            rendered = self.con.execute(render_query, [template_str, context_json]).fetchone()
+            context_json = _json.dumps(context)
+            rendered = self._read_one(render_query, [template_str, context_json])
 
             if rendered:
                 return {"rendered": rendered[0]}
@@ -415,11 +550,29 @@ class SpecEngine:
         except Exception as e:
             return {"error": str(e), "rendered": None}
 
+    def _fetch_template(self, template_name: str) -> str | None:
+        """Fetch the latest active template source for a template spec."""
+        # Get the template from spec_payloads
+        template_query = """
+            SELECT p.payload->>'template'
+            FROM spec_objects o
+            JOIN spec_payloads p ON p.object_id = o.id
+            WHERE o.kind IN ('task_template', 'prompt_template')
+              AND o.name = ?
+              AND o.status = 'active'
+            ORDER BY o.version DESC
+            LIMIT 1
+        """
+        result = self._read_one(template_query, [template_name])
+        if not result or not result[0]:
+            return None
+        return result[0]
+
     def validate_payload_against_spec(
         self,
         kind: str,
         name: str,
-        payload: dict[str, Any],
+        payload: dict[str, Any] | str,
     ) -> dict[str, Any]:
         """
         Validate a JSON payload against a spec's schema.
@@ -427,81 +580,73 @@ class SpecEngine:
         Args:
             kind: Spec kind to validate against
             name: Spec name (should be a 'schema' kind or have schema_ref)
-            payload: JSON payload to validate
+            payload: JSON payload to validate, as a dict or an already serialized
+                JSON string (passed through as is)
 
         Returns:
             Dict with 'ok' boolean and 'errors' list
         """
         try:
-            # If kind is 'schema', use that directly
-            # Otherwise, look up the schema_ref
-            if kind == "schema":
-                schema_query = """
-                    SELECT p.payload
-                    FROM spec_objects o
-                    JOIN spec_payloads p ON p.object_id = o.id
-                    WHERE o.kind = 'schema'
-                      AND o.name = ?
-                      AND o.status = 'active'
-                    ORDER BY o.version DESC
-                    LIMIT 1
-                """
-                result = self.con.execute(schema_query, [name]).fetchone()
-            else:
-                # Get schema_ref from the spec
-                ref_query = """
-                    SELECT p.schema_ref
-                    FROM spec_objects o
-                    JOIN spec_payloads p ON p.object_id = o.id
-                    WHERE o.kind = ?
-                      AND o.name = ?
-                      AND o.status = 'active'
-                    ORDER BY o.version DESC
-                    LIMIT 1
-                """
-                ref_result = self.con.execute(ref_query, [kind, name]).fetchone()
-                if not ref_result or not ref_result[0]:
-                    return {"ok": True, "errors": [], "note": "No schema_ref defined for this spec"}
-
-                schema_ref = ref_result[0]
-
-                # Now get the actual schema
-                schema_query = """
+            # Resolve the schema name (the spec itself for kind 'schema', otherwise
+            # its schema_ref) and fetch that schema's payload in one round trip
+            schema_query = """
+                WITH target AS (
+                    SELECT CASE WHEN ? = 'schema' THEN ? ELSE (
+                        SELECT p.schema_ref
+                        FROM spec_objects o
+                        JOIN spec_payloads p ON p.object_id = o.id
+                        WHERE o.kind = ?
+                          AND o.name = ?
+                          AND o.status = 'active'
+                        ORDER BY o.version DESC
+                        LIMIT 1
+                    ) END AS schema_name
+                )
+                SELECT t.schema_name, (
                     SELECT p.payload
                     FROM spec_objects o
                     JOIN spec_payloads p ON p.object_id = o.id
                     WHERE o.kind = 'schema'
-                      AND o.name = ?
+                      AND o.name = t.schema_name
                       AND o.status = 'active'
                     ORDER BY o.version DESC
                     LIMIT 1
-                """
-                result = self.con.execute(schema_query, [schema_ref]).fetchone()
-
-            if not result or not result[0]:
+                )
+                FROM target t
+            """
+            self._check_specs_version()
+            cached = self._schema_cache.get((kind, name))
+            if cached is None:
+                cached = self._read_one(schema_query, [kind, name, kind, name])
+                # Misses are not cached; the schema may be created next
+                if cached[1]:
+                    self._schema_cache[(kind, name)] = cached
+            schema_name, schema_payload = cached
+
+            if kind != "schema" and not schema_name:
+                return {"ok": True, "errors": [], "note": "No schema_ref defined for this spec"}
+            if not schema_payload:
                 return {"ok": False, "errors": [f"Schema not found: {name}"]}
 
-            schema_json = result[0]
-            if isinstance(schema_json, str):
-                schema_json = json.loads(schema_json)
+            # JSON columns come back as text; pass it through without re-encoding
+            if isinstance(schema_payload, str):
+                schema_str = schema_payload
+            else:
+                schema_str = _json.dumps(schema_payload)
 
             # Validate using json_schema extension
             validate_query = "SELECT json_schema_validate(?, ?)"
-            payload_json = json.dumps(payload)
-            schema_str = json.dumps(schema_json)
+            payload_json = payload if isinstance(payload, str) else _json.dumps(payload)
 
-            validation_result = self.con.execute(
-                validate_query,
-                [schema_str, payload_json]
-            ).fetchone()
+            validation_result = self._read_one(validate_query, [schema_str, payload_json])
 
             if validation_result and validation_result[0]:
                 # Non-empty result means validation errors
                 errors = validation_result[0]
                 if isinstance(errors, str):
                     try:
-                        errors = json.loads(errors)
-                    except json.JSONDecodeError:
+                        errors = _json.loads(errors)
+                    except _json.JSONDecodeError:
                         errors = [errors]
                 return {"ok": False, "errors": errors if isinstance(errors, list) else [errors]}
 
@@ -528,8 +673,8 @@ class SpecEngine:
                 data = result[0]
                 if isinstance(data, str):
                     try:
-                        data = json.loads(data)
-                    except json.JSONDecodeError:
+                        data = _json.loads(data)
+                    except _json.JSONDecodeError:
                         pass
                 return {"data": data}
             return {"error": "No result from remote MCP server"}
@@ -555,14 +700,14 @@ class SpecEngine:
         """
         try:
             query = "SELECT mcp_call_tool(?, ?, ?)"
-            args_json = json.dumps(args)
+            args_json = _json.dumps(args)
             result = self.con.execute(query, [server, tool, args_json]).fetchone()
             if result:
                 data = result[0]
                 if isinstance(data, str):
                     try:
-                        data = json.loads(data)
-                    except json.JSONDecodeError:
+                        data = _json.loads(data)
+                    except _json.JSONDecodeError:
                         pass
                 return {"result": data}
             return {"error": "No result from remote MCP tool"}
@@ -585,30 +730,151 @@ class SpecEngine:
             True if started successfully
         """
         try:
+            # Bound, not interpolated: a quote in api_key cannot change the SQL
             if api_key:
-                self.con.sql(f"SELECT httpserve_start('0.0.0.0', {port}, 'X-API-Key {api_key}')")
+                self.con.execute(
+                    "SELECT httpserve_start('0.0.0.0', ?::INTEGER, ?)",
+                    [port, f"X-API-Key {api_key}"],
+                )
             else:
-                self.con.sql(f"SELECT httpserve_start('0.0.0.0', {port})")
-            print(f"Spec Engine: HTTP server started on port {port}", file=sys.stderr)
+                self.con.execute("SELECT httpserve_start('0.0.0.0', ?::INTEGER)", [port])
+            logger.info(f"Spec Engine: HTTP server started on port {port}")
             return True
         except Exception as e:
-            print(f"Spec Engine: Failed to start HTTP server: {e}", file=sys.stderr)
+            logger.error(f"Spec Engine: Failed to start HTTP server: {e}")
             return False
 
     def stop_http_server(self) -> bool:
         """Stop the HTTP server."""
         try:
             self.con.sql("SELECT httpserve_stop()")
-            print("Spec Engine: HTTP server stopped", file=sys.stderr)
+            logger.info("Spec Engine: HTTP server stopped")
             return True
         except Exception as e:
-            print(f"Spec Engine: Failed to stop HTTP server: {e}", file=sys.stderr)
+            logger.error(f"Spec Engine: Failed to stop HTTP server: {e}")
             return False
 
     # =========================================================================
     # CRUD Operations
     # =========================================================================
 
+    def _specs_changed(self) -> None:
+        """Drop state derived from the spec tables after they are written."""
+        self._template_cache.clear()
+        self._schema_cache.clear()
+        self._search_cache.clear()
+        self._specs_version = None
+
+    def _check_specs_version(self) -> None:
+        """
+        Drop the template and schema caches if the spec tables changed outside the engine.
+
+        Row counts, max ids and the latest updated_at catch specs created, deleted
+        or updated by SQL macros, MCP SQL tools or other connections. It also
+        catches a reader that cached a row just before an engine write committed.
+        """
+        try:
+            version = self._read_one(
+                """
+                SELECT count(*), max(id), max(updated_at),
+                       (SELECT count(*) FROM spec_payloads), (SELECT max(id) FROM spec_payloads)
+                FROM spec_objects
+                """
+            )
+        except Exception:
+            version = None
+        if version is None or version != self._specs_version:
+            self._template_cache.clear()
+            self._schema_cache.clear()
+            self._specs_version = version
+
+    def _embeddings_changed(self) -> None:
+        """Drop state derived from spec_embeddings before (or after) it is written."""
+        self._search_cache.clear()
+        self._embedding_matrix = None
+
+    def _check_embeddings_version(self) -> None:
+        """
+        Drop embedding-derived state if spec_embeddings changed outside the engine.
+
+        Row count and highest id are a cheap signal for rows inserted or deleted
+        by SQL macros, MCP SQL tools or other connections, which never pass
+        through store_embedding.
+        """
+        try:
+            version = self._read_one("SELECT count(*), max(id) FROM spec_embeddings")
+        except Exception:
+            version = None
+        if version is None or version != self._embeddings_version:
+            self._embeddings_changed()
+            self._embeddings_version = version
+
+    @contextmanager
+    def _pooled_cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Check out a cursor on the engine's database for the duration of a query.
+
+        Cursors are separate connections to the same database, so reads from other
+        threads, or from SQL UDFs whose outer query still holds self.con, do not
+        wait on (or deadlock against) self.con. Writes stay on self.con under
+        the write lock.
+        """
+        try:
+            cursor = self._cursors.get_nowait()
+        except queue.Empty:
+            cursor = self.con.cursor()
+        try:
+            yield cursor
+        finally:
+            self._cursors.put(cursor)
+
+    def _read_rows(self, query: str, params: Any = None) -> list[tuple]:
+        """Run a read query on a pooled cursor and return all of its rows."""
+        with self._pooled_cursor() as cursor:
+            return cursor.execute(query, params).fetchall()
+
+    def _read_dicts(self, query: str, params: Any, columns: Sequence[str]) -> list[dict[str, Any]]:
+        """
+        Run a read query on a pooled cursor and return its rows as dicts.
+
+        Rows are streamed through _iter_rows while the cursor is checked out, so
+        the result is built without a full list of row tuples next to it.
+        """
+        with self._pooled_cursor() as cursor:
+            return [dict(zip(columns, row)) for row in _iter_rows(cursor.execute(query, params))]
+
+    def _read_one(self, query: str, params: Any = None) -> tuple | None:
+        """Run a read query on a pooled cursor and return its first row."""
+        with self._pooled_cursor() as cursor:
+            return cursor.execute(query, params).fetchone()
+
+    def _cached_search(self, key: tuple) -> list[dict[str, Any]] | None:
+        """Return a copy of cached search results for key, or None on a miss."""
+        results = self._search_cache.get(key)
+        if results is None:
+            return None
+        self._search_cache.move_to_end(key)
+        return [dict(row) for row in results]
+
+    def _cache_search(self, key: tuple, results: list[dict[str, Any]]) -> None:
+        """Cache search results for key, evicting the least recently used entry."""
+        self._search_cache[key] = [dict(row) for row in results]
+        if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run the enclosed statements in one transaction, rolling back on error."""
+        with self._write_lock:
+            self.con.begin()
+            try:
+                yield
+            except BaseException:
+                self.con.rollback()
+                raise
+            self.con.commit()
+
+    @_serialized_write
     def spec_create(
         self,
         kind: str,
@@ -637,46 +903,129 @@ class SpecEngine:
             Dict with created spec id or error
         """
         try:
-            # Get next ID
+            # Insert spec object (ID from spec_objects_seq)
             next_id = self.con.execute(
-                "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_objects"
-            ).fetchone()[0]
-
-            # Insert spec object
-            self.con.execute(
                 """
                 INSERT INTO spec_objects (id, kind, name, version, status, summary)
-                VALUES (?, ?, ?, ?, ?, ?)
+                VALUES (nextval('spec_objects_seq'), ?, ?, ?, ?, ?)
+                RETURNING id
                 """,
-                [next_id, kind, name, version, status, summary]
-            )
+                [kind, name, version, status, summary]
+            ).fetchone()[0]
 
             # Insert doc if provided
             if doc:
-                doc_id = self.con.execute(
-                    "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_docs"
-                ).fetchone()[0]
                 self.con.execute(
-                    "INSERT INTO spec_docs (id, object_id, doc) VALUES (?, ?, ?)",
-                    [doc_id, next_id, doc]
+                    "INSERT INTO spec_docs (id, object_id, doc) "
+                    "VALUES (nextval('spec_docs_seq'), ?, ?)",
+                    [next_id, doc]
                 )
 
             # Insert payload if provided
             if payload is not None:
-                payload_id = self.con.execute(
-                    "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_payloads"
-                ).fetchone()[0]
-                payload_json = json.dumps(payload) if isinstance(payload, dict) else payload
+                payload_json = _json.dumps(payload) if isinstance(payload, dict) else payload
                 self.con.execute(
-                    "INSERT INTO spec_payloads (id, object_id, payload, schema_ref) VALUES (?, ?, ?, ?)",
-                    [payload_id, next_id, payload_json, schema_ref]
+                    "INSERT INTO spec_payloads (id, object_id, payload, schema_ref) "
+                    "VALUES (nextval('spec_payloads_seq'), ?, ?, ?)",
+                    [next_id, payload_json, schema_ref]
                 )
 
             return {"id": next_id, "created": True}
 
         except Exception as e:
             return {"error": str(e), "created": False}
+        finally:
+            self._specs_changed()
+
+    @_serialized_write
+    def spec_create_many(self, specs: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Create several specs in one transaction.
 
+        Each table gets one columnar INSERT ... SELECT UNNEST(?) instead of one
+        INSERT per spec.
+
+        Args:
+            specs: Dicts with the spec_create arguments (kind, name, summary, and
+                optionally version, status, doc, payload, schema_ref)
+
+        Returns:
+            Dict with the created spec ids (in input order) or error
+        """
+        if not specs:
+            return {"ids": [], "created": True}
+
+        try:
+            with self._transaction():
+                ids = [
+                    row[0]
+                    for row in self.con.execute(
+                        "SELECT nextval('spec_objects_seq') AS id FROM range(?) ORDER BY id",
+                        [len(specs)],
+                    ).fetchall()
+                ]
+
+                self.con.execute(
+                    """
+                    INSERT INTO spec_objects (id, kind, name, version, status, summary)
+                    SELECT UNNEST(?::INTEGER[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]),
+                           UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[])
+                    """,
+                    [
+                        ids,
+                        [spec["kind"] for spec in specs],
+                        [spec["name"] for spec in specs],
+                        [spec.get("version", "1.0.0") for spec in specs],
+                        [spec.get("status", "draft") for spec in specs],
+                        [spec["summary"] for spec in specs],
+                    ],
+                )
+
+                docs = [
+                    (spec_id, spec["doc"]) for spec_id, spec in zip(ids, specs) if spec.get("doc")
+                ]
+                if docs:
+                    self.con.execute(
+                        """
+                        INSERT INTO spec_docs (id, object_id, doc)
+                        SELECT nextval('spec_docs_seq'), UNNEST(?::INTEGER[]), UNNEST(?::VARCHAR[])
+                        """,
+                        [[d[0] for d in docs], [d[1] for d in docs]],
+                    )
+
+                payloads = [
+                    (
+                        spec_id,
+                        _json.dumps(spec["payload"])
+                        if isinstance(spec["payload"], dict)
+                        else spec["payload"],
+                        spec.get("schema_ref"),
+                    )
+                    for spec_id, spec in zip(ids, specs)
+                    if spec.get("payload") is not None
+                ]
+                if payloads:
+                    self.con.execute(
+                        """
+                        INSERT INTO spec_payloads (id, object_id, payload, schema_ref)
+                        SELECT nextval('spec_payloads_seq'), UNNEST(?::INTEGER[]),
+                               UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[])
+                        """,
+                        [
+                            [p[0] for p in payloads],
+                            [p[1] for p in payloads],
+                            [p[2] for p in payloads],
+                        ],
+                    )
+
+            return {"ids": ids, "created": True}
+
+        except Exception as e:
+            return {"error": str(e), "created": False}
+        finally:
+            self._specs_changed()
+
+    @_serialized_write
     def spec_update(
         self,
         id: int,
@@ -709,7 +1058,8 @@ class SpecEngine:
                 updates.append("summary = ?")
                 params.append(summary)
 
-            if updates:
+            # Doc and payload edits bump updated_at too, so cached readers see them
+            if updates or doc is not None or payload is not None:
                 updates.append("updated_at = current_timestamp")
                 params.append(id)
                 self.con.execute(
@@ -717,49 +1067,36 @@ class SpecEngine:
                     params
                 )
 
+            # One doc and one payload per spec (unique object_id), so both are upserts
             if doc is not None:
-                # Update or insert doc
-                existing = self.con.execute(
-                    "SELECT id FROM spec_docs WHERE object_id = ?", [id]
-                ).fetchone()
-                if existing:
-                    self.con.execute(
-                        "UPDATE spec_docs SET doc = ? WHERE object_id = ?",
-                        [doc, id]
-                    )
-                else:
-                    doc_id = self.con.execute(
-                        "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_docs"
-                    ).fetchone()[0]
-                    self.con.execute(
-                        "INSERT INTO spec_docs (id, object_id, doc) VALUES (?, ?, ?)",
-                        [doc_id, id, doc]
-                    )
+                self.con.execute(
+                    """
+                    INSERT INTO spec_docs (id, object_id, doc)
+                    VALUES (nextval('spec_docs_seq'), ?, ?)
+                    ON CONFLICT (object_id) DO UPDATE SET doc = EXCLUDED.doc
+                    """,
+                    [id, doc]
+                )
 
             if payload is not None:
-                payload_json = json.dumps(payload) if isinstance(payload, dict) else payload
-                existing = self.con.execute(
-                    "SELECT id FROM spec_payloads WHERE object_id = ?", [id]
-                ).fetchone()
-                if existing:
-                    self.con.execute(
-                        "UPDATE spec_payloads SET payload = ? WHERE object_id = ?",
-                        [payload_json, id]
-                    )
-                else:
-                    payload_id = self.con.execute(
-                        "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_payloads"
-                    ).fetchone()[0]
-                    self.con.execute(
-                        "INSERT INTO spec_payloads (id, object_id, payload) VALUES (?, ?, ?)",
-                        [payload_id, id, payload_json]
-                    )
+                payload_json = _json.dumps(payload) if isinstance(payload, dict) else payload
+                self.con.execute(
+                    """
+                    INSERT INTO spec_payloads (id, object_id, payload)
+                    VALUES (nextval('spec_payloads_seq'), ?, ?)
+                    ON CONFLICT (object_id) DO UPDATE SET payload = EXCLUDED.payload
+                    """,
+                    [id, payload_json]
+                )
 
             return {"updated": True}
 
         except Exception as e:
             return {"error": str(e), "updated": False}
+        finally:
+            self._specs_changed()
 
+    @_serialized_write
     def spec_delete(self, id: int) -> dict[str, Any]:
         """
         Delete a spec by ID.
@@ -771,13 +1108,17 @@ class SpecEngine:
             Dict with success status or error
         """
         try:
-            # Delete related records first (no foreign key cascade in our schema)
-            self.con.execute("DELETE FROM spec_docs WHERE object_id = ?", [id])
-            self.con.execute("DELETE FROM spec_payloads WHERE object_id = ?", [id])
-            self.con.execute("DELETE FROM spec_objects WHERE id = ?", [id])
+            # Delete related records first (DuckDB has no ON DELETE CASCADE), in one
+            # transaction so a failure cannot leave a spec without its doc/payload
+            with self._transaction():
+                self.con.execute("DELETE FROM spec_docs WHERE object_id = ?", [id])
+                self.con.execute("DELETE FROM spec_payloads WHERE object_id = ?", [id])
+                self.con.execute("DELETE FROM spec_objects WHERE id = ?", [id])
             return {"deleted": True}
         except Exception as e:
             return {"error": str(e), "deleted": False}
+        finally:
+            self._specs_changed()
 
     # =========================================================================
     # Utility Methods
@@ -818,7 +1159,7 @@ class SpecEngine:
             ).fetchall()
             return [row[0] for row in result]
         except Exception as e:
-            print(f"Spec Engine: Error getting extensions: {e}", file=sys.stderr)
+            logger.error(f"Spec Engine: Error getting extensions: {e}")
             return []
 
     def get_spec_kinds(self) -> list[str]:
@@ -839,6 +1180,7 @@ class SpecEngine:
     # Meta-Learning Methods (Self-Improvement)
     # =========================================================================
 
+    @_serialized_write
     def record_usage(self, spec_id: int, was_success: bool) -> dict[str, Any]:
         """
         Record that a spec was used and whether it was successful.
@@ -852,44 +1194,34 @@ class SpecEngine:
             Dict with updated stats
         """
         try:
-            # Get current values
+            # Fold the new outcome into the running rate server-side; SET expressions
+            # all see the pre-update use_count and success_rate
             result = self.con.execute(
-                "SELECT use_count, success_rate FROM spec_objects WHERE id = ?",
-                [spec_id]
-            ).fetchone()
-
-            if not result:
-                return {"error": f"Spec {spec_id} not found"}
-
-            use_count, success_rate = result
-
-            # Calculate new success rate
-            if use_count == 0:
-                new_success_rate = 1.0 if was_success else 0.0
-            else:
-                new_success_rate = (success_rate * use_count + (1.0 if was_success else 0.0)) / (use_count + 1)
-
-            # Update
-            self.con.execute(
                 """
                 UPDATE spec_objects
-                SET use_count = use_count + 1,
-                    success_rate = ?,
+                SET success_rate = (success_rate * use_count + ?) / (use_count + 1),
+                    use_count = use_count + 1,
                     updated_at = current_timestamp
                 WHERE id = ?
+                RETURNING use_count, success_rate
                 """,
-                [new_success_rate, spec_id]
-            )
+                [1.0 if was_success else 0.0, spec_id]
+            ).fetchone()
 
+            if not result:
+                return {"error": f"Spec {spec_id} not found"}
+
+            use_count, success_rate = result
             return {
                 "spec_id": spec_id,
-                "use_count": use_count + 1,
-                "success_rate": new_success_rate
+                "use_count": use_count,
+                "success_rate": success_rate
             }
 
         except Exception as e:
             return {"error": str(e)}
 
+    @_serialized_write
     def record_feedback(
         self,
         spec_id: int,
@@ -916,36 +1248,121 @@ class SpecEngine:
             Dict with feedback ID
         """
         try:
-            feedback_id = self.con.execute(
-                "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_feedback"
-            ).fetchone()[0]
+            # Feedback row and usage stats commit together
+            with self._transaction():
+                feedback_id = self.con.execute(
+                    """
+                    INSERT INTO spec_feedback
+                        (id, spec_id, session_id, feedback_type, context, outcome, score, notes)
+                    VALUES (nextval('spec_feedback_seq'), ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
+                    """,
+                    [
+                        spec_id,
+                        session_id,
+                        feedback_type,
+                        _json.dumps(context) if context else None,
+                        _json.dumps(outcome) if outcome else None,
+                        score,
+                        notes,
+                    ]
+                ).fetchone()[0]
 
-            self.con.execute(
-                """
-                INSERT INTO spec_feedback (id, spec_id, session_id, feedback_type, context, outcome, score, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    feedback_id,
-                    spec_id,
-                    session_id,
-                    feedback_type,
-                    json.dumps(context) if context else None,
-                    json.dumps(outcome) if outcome else None,
-                    score,
-                    notes,
+                # Also update usage stats
+                was_success = feedback_type == "success" or score > 0.5
+                self.record_usage(spec_id, was_success)
+
+            return {"feedback_id": feedback_id}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    @_serialized_write
+    def record_feedback_many(self, feedback: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Record several feedback events in one transaction.
+
+        The feedback rows go in with one columnar INSERT ... SELECT UNNEST(?), and
+        the usage stats of all affected specs are updated by one aggregated UPDATE.
+
+        Args:
+            feedback: Dicts with the record_feedback arguments (spec_id, feedback_type,
+                and optionally score, context, outcome, notes, session_id)
+
+        Returns:
+            Dict with the feedback ids (in input order) or error
+        """
+        if not feedback:
+            return {"feedback_ids": []}
+
+        scores = [fb.get("score", 0.0) for fb in feedback]
+        try:
+            with self._transaction():
+                feedback_ids = [
+                    row[0]
+                    for row in self.con.execute(
+                        "SELECT nextval('spec_feedback_seq') AS id FROM range(?) ORDER BY id",
+                        [len(feedback)],
+                    ).fetchall()
                 ]
-            )
 
-            # Also update usage stats
-            was_success = feedback_type == "success" or score > 0.5
-            self.record_usage(spec_id, was_success)
+                self.con.execute(
+                    """
+                    INSERT INTO spec_feedback
+                        (id, spec_id, session_id, feedback_type, context, outcome, score, notes)
+                    SELECT UNNEST(?::INTEGER[]), UNNEST(?::INTEGER[]), UNNEST(?::VARCHAR[]),
+                           UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]), UNNEST(?::VARCHAR[]),
+                           UNNEST(?::DOUBLE[]), UNNEST(?::VARCHAR[])
+                    """,
+                    [
+                        feedback_ids,
+                        [fb["spec_id"] for fb in feedback],
+                        [fb.get("session_id") for fb in feedback],
+                        [fb["feedback_type"] for fb in feedback],
+                        [
+                            _json.dumps(fb["context"]) if fb.get("context") else None
+                            for fb in feedback
+                        ],
+                        [
+                            _json.dumps(fb["outcome"]) if fb.get("outcome") else None
+                            for fb in feedback
+                        ],
+                        scores,
+                        [fb.get("notes") for fb in feedback],
+                    ],
+                )
 
-            return {"feedback_id": feedback_id}
+                # Same running-rate update as record_usage, with every event for a
+                # spec folded in at once
+                self.con.execute(
+                    """
+                    UPDATE spec_objects
+                    SET success_rate = (success_rate * use_count + u.successes)
+                                       / (use_count + u.uses),
+                        use_count = use_count + u.uses,
+                        updated_at = current_timestamp
+                    FROM (
+                        SELECT spec_id, count(*) AS uses, sum(ok::INTEGER) AS successes
+                        FROM (SELECT UNNEST(?::INTEGER[]) AS spec_id, UNNEST(?::BOOLEAN[]) AS ok)
+                        GROUP BY spec_id
+                    ) u
+                    WHERE spec_objects.id = u.spec_id
+                    """,
+                    [
+                        [fb["spec_id"] for fb in feedback],
+                        [
+                            fb["feedback_type"] == "success" or score > 0.5
+                            for fb, score in zip(feedback, scores)
+                        ],
+                    ],
+                )
+
+            return {"feedback_ids": feedback_ids}
 
         except Exception as e:
             return {"error": str(e)}
 
+    @_serialized_write
     def create_relationship(
         self,
         from_id: int,
@@ -967,17 +1384,14 @@ class SpecEngine:
         """
         try:
             rel_id = self.con.execute(
-                "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_relationships"
-            ).fetchone()[0]
-
-            self.con.execute(
                 """
                 INSERT INTO spec_relationships (id, from_id, to_id, rel_type, metadata)
-                VALUES (?, ?, ?, ?, ?)
+                VALUES (nextval('spec_relationships_seq'), ?, ?, ?, ?)
                 ON CONFLICT (from_id, to_id, rel_type) DO UPDATE SET metadata = EXCLUDED.metadata
+                RETURNING id
                 """,
-                [rel_id, from_id, to_id, rel_type, json.dumps(metadata) if metadata else None]
-            )
+                [from_id, to_id, rel_type, _json.dumps(metadata) if metadata else None]
+            ).fetchone()[0]
 
             return {"relationship_id": rel_id}
 
@@ -1012,10 +1426,8 @@ class SpecEngine:
                 JOIN spec_objects o ON o.id = r.from_id
                 WHERE r.to_id = ?
             """
-            result = self.con.execute(query, [spec_id, spec_id]).fetchall()
-
             columns = ["rel_type", "direction", "id", "kind", "name", "version", "status", "summary"]
-            return [dict(zip(columns, row)) for row in result]
+            return self._read_dicts(query, [spec_id, spec_id], columns)
 
         except Exception as e:
             return []
@@ -1031,22 +1443,22 @@ class SpecEngine:
             Dict with performance metrics
         """
         try:
+            # Same aggregates as the spec_performance macro. Feedback and adaptations
+            # are counted in separate subqueries, so neither multiplies the other
             query = """
                 SELECT
                     o.id, o.kind, o.name,
                     o.use_count,
                     o.success_rate,
                     o.confidence,
-                    COUNT(f.id) AS feedback_count,
-                    AVG(f.score) AS avg_score,
-                    COUNT(a.id) AS adaptation_count
+                    (SELECT count(*) FROM spec_feedback WHERE spec_id = o.id) AS feedback_count,
+                    (SELECT avg(score) FROM spec_feedback WHERE spec_id = o.id) AS avg_score,
+                    (SELECT count(*) FROM spec_adaptations WHERE spec_id = o.id)
+                        AS adaptation_count
                 FROM spec_objects o
-                LEFT JOIN spec_feedback f ON f.spec_id = o.id
-                LEFT JOIN spec_adaptations a ON a.spec_id = o.id
                 WHERE o.id = ?
-                GROUP BY o.id, o.kind, o.name, o.use_count, o.success_rate, o.confidence
             """
-            result = self.con.execute(query, [spec_id]).fetchone()
+            result = self._read_one(query, [spec_id])
 
             if not result:
                 return {"error": f"Spec {spec_id} not found"}
@@ -1085,15 +1497,14 @@ class SpecEngine:
                   AND status = 'active'
                 ORDER BY success_rate ASC, use_count DESC
             """
-            result = self.con.execute(query, [min_usage, max_success_rate]).fetchall()
-
             columns = ["id", "kind", "name", "version", "status",
                        "use_count", "success_rate", "confidence", "summary"]
-            return [dict(zip(columns, row)) for row in result]
+            return self._read_dicts(query, [min_usage, max_success_rate], columns)
 
         except Exception as e:
             return []
 
+    @_serialized_write
     def record_adaptation(
         self,
         spec_id: int,
@@ -1119,30 +1530,29 @@ class SpecEngine:
         """
         try:
             adaptation_id = self.con.execute(
-                "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_adaptations"
-            ).fetchone()[0]
-
-            self.con.execute(
                 """
-                INSERT INTO spec_adaptations (id, spec_id, adaptation_type, reason, changes, metrics_before, metrics_after)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO spec_adaptations
+                    (id, spec_id, adaptation_type, reason, changes,
+                     metrics_before, metrics_after)
+                VALUES (nextval('spec_adaptations_seq'), ?, ?, ?, ?, ?, ?)
+                RETURNING id
                 """,
                 [
-                    adaptation_id,
                     spec_id,
                     adaptation_type,
                     reason,
-                    json.dumps(changes),
-                    json.dumps(metrics_before) if metrics_before else None,
-                    json.dumps(metrics_after) if metrics_after else None,
+                    _json.dumps(changes),
+                    _json.dumps(metrics_before) if metrics_before else None,
+                    _json.dumps(metrics_after) if metrics_after else None,
                 ]
-            )
+            ).fetchone()[0]
 
             return {"adaptation_id": adaptation_id}
 
         except Exception as e:
             return {"error": str(e)}
 
+    @_serialized_write
     def record_learning(
         self,
         learning_type: str,
@@ -1168,24 +1578,20 @@ class SpecEngine:
         """
         try:
             learning_id = self.con.execute(
-                "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_learning"
-            ).fetchone()[0]
-
-            self.con.execute(
                 """
                 INSERT INTO spec_learning (id, learning_type, category, description, evidence, confidence, application)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                VALUES (nextval('spec_learning_seq'), ?, ?, ?, ?, ?, ?)
+                RETURNING id
                 """,
                 [
-                    learning_id,
                     learning_type,
                     category,
                     description,
-                    json.dumps(evidence) if evidence else None,
+                    _json.dumps(evidence) if evidence else None,
                     confidence,
                     application,
                 ]
-            )
+            ).fetchone()[0]
 
             return {"learning_id": learning_id}
 
@@ -1214,16 +1620,12 @@ class SpecEngine:
                 ORDER BY confidence DESC, created_at DESC
                 LIMIT ?
             """
-            result = self.con.execute(query, [limit]).fetchall()
-
             columns = ["id", "learning_type", "category", "description",
                        "confidence", "application", "created_at"]
-            specs = []
-            for row in result:
-                spec = dict(zip(columns, row))
+            specs = self._read_dicts(query, [limit], columns)
+            for spec in specs:
                 if spec.get("created_at"):
                     spec["created_at"] = str(spec["created_at"])
-                specs.append(spec)
             return specs
 
         except Exception as e:
@@ -1233,6 +1635,7 @@ class SpecEngine:
     # Provenance Methods (Source Tracking)
     # =========================================================================
 
+    @_serialized_write
     def set_upstream_source(
         self,
         spec_id: int,
@@ -1291,17 +1694,13 @@ class SpecEngine:
                   AND sync_status IN ('outdated', 'conflict')
                 ORDER BY last_sync ASC NULLS FIRST
             """
-            result = self.con.execute(query).fetchall()
-
             columns = ["id", "kind", "name", "version", "source_type",
                        "source_url", "upstream_version", "last_sync",
                        "sync_status", "summary"]
-            specs = []
-            for row in result:
-                spec = dict(zip(columns, row))
+            specs = self._read_dicts(query, None, columns)
+            for spec in specs:
                 if spec.get("last_sync"):
                     spec["last_sync"] = str(spec["last_sync"])
-                specs.append(spec)
             return specs
 
         except Exception as e:
@@ -1311,6 +1710,7 @@ class SpecEngine:
     # Intelligence Layer Methods (RAG/Embeddings)
     # =========================================================================
 
+    @_serialized_write
     def store_embedding(
         self,
         content: str,
@@ -1340,31 +1740,37 @@ class SpecEngine:
             import hashlib
             content_hash = hashlib.sha256(content.encode()).hexdigest()
 
+            # Stored at unit length so similarity searches can skip the norms
+            unit = _unit_vector(embedding)
             emb_id = self.con.execute(
-                "SELECT COALESCE(MAX(id), 0) + 1 FROM spec_embeddings"
-            ).fetchone()[0]
-
-            self.con.execute(
                 """
                 INSERT INTO spec_embeddings
-                    (id, spec_id, org_id, content_type, content_hash, content, embedding, embedding_model, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    (id, spec_id, org_id, content_type, content_hash, content, embedding,
+                     embedding_normalized, embedding_model, metadata)
+                VALUES (nextval('spec_embeddings_seq'), ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT (content_hash, chunk_index) DO UPDATE SET
-                    embedding = EXCLUDED.embedding
+                    embedding = EXCLUDED.embedding,
+                    embedding_normalized = EXCLUDED.embedding_normalized
+                RETURNING id
                 """,
                 [
-                    emb_id,
                     spec_id,
                     org_id,
                     content_type,
                     content_hash,
                     content,
-                    embedding,
+                    unit,
+                    any(unit),
                     embedding_model,
-                    json.dumps(metadata) if metadata else None,
+                    _json.dumps(metadata) if metadata else None,
                 ]
-            )
+            ).fetchone()[0]
 
+            self._search_cache.clear()
+            if not self._update_embedding_matrix(emb_id, content_type, unit):
+                # Rebuilt by the next search
+                self._embeddings_changed()
+                self._embeddings_version = None
             return {"embedding_id": emb_id, "content_hash": content_hash}
 
         except Exception as e:
@@ -1387,39 +1793,172 @@ class SpecEngine:
         Returns:
             List of similar content with similarity scores
         """
+        self._check_embeddings_version()
+        cache_key = ("similar", tuple(query_embedding), k, content_type)
+        cached = self._cached_search(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            if content_type:
-                query = """
-                    SELECT
-                        id, spec_id, org_id, content_type,
-                        content, metadata,
-                        array_cosine_similarity(embedding, ?::FLOAT[]) AS similarity
-                    FROM spec_embeddings
-                    WHERE content_type = ?
-                      AND embedding IS NOT NULL
-                    ORDER BY similarity DESC
-                    LIMIT ?
-                """
-                result = self.con.execute(query, [query_embedding, content_type, k]).fetchall()
-            else:
-                query = """
-                    SELECT
-                        id, spec_id, org_id, content_type,
-                        content, metadata,
-                        array_cosine_similarity(embedding, ?::FLOAT[]) AS similarity
-                    FROM spec_embeddings
-                    WHERE embedding IS NOT NULL
-                    ORDER BY similarity DESC
-                    LIMIT ?
-                """
-                result = self.con.execute(query, [query_embedding, k]).fetchall()
+            matrix = self._load_embedding_matrix()
+            if matrix is not None:
+                results = self._search_similar_matrix(matrix, query_embedding, k, content_type)
+                self._cache_search(cache_key, results)
+                return results
 
+            query = f"""
+                SELECT
+                    id, spec_id, org_id, content_type,
+                    content, metadata,
+                    {_SIMILARITY_SQL} AS similarity
+                FROM spec_embeddings
+                WHERE ($content_type IS NULL OR content_type = $content_type)
+                  AND embedding IS NOT NULL
+                ORDER BY similarity DESC
+                LIMIT $k
+            """
+            params = {
+                "embedding": _unit_vector(query_embedding),
+                "content_type": content_type,
+                "k": k,
+            }
             columns = ["id", "spec_id", "org_id", "content_type", "content", "metadata", "similarity"]
-            return [dict(zip(columns, row)) for row in result]
+            results = self._read_dicts(query, params, columns)
+            self._cache_search(cache_key, results)
+            return results
 
         except Exception as e:
             return []
 
+    def _load_embedding_matrix(self) -> tuple | None:
+        """
+        Return (ids, content types, unit-length matrix) for every stored embedding.
+
+        Built with one scan on first use and kept up to date by store_embedding;
+        writes made outside the engine reset it (see _check_embeddings_version)
+        and the next search rebuilds it. Returns
+        None when NumPy is not installed or the embeddings differ in dimension,
+        in which case search_similar scores rows in SQL.
+        """
+        if np is None:
+            return None
+        if self._embedding_matrix is None:
+            with self._pooled_cursor() as cursor:
+                data = cursor.execute(
+                    """
+                    SELECT id, content_type, embedding
+                    FROM spec_embeddings
+                    WHERE embedding IS NOT NULL
+                    ORDER BY id
+                    """
+                ).fetchnumpy()
+            try:
+                matrix = np.stack(data["embedding"]).astype(np.float32)
+            except ValueError:
+                # Mixed dimensions, or no rows at all
+                matrix = None if len(data["id"]) else np.empty((0, 0), np.float32)
+            else:
+                # Rows stored before normalization still get cosine similarity
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix /= np.where(norms == 0, 1, norms)
+            self._embedding_matrix = (data["id"], data["content_type"], matrix, len(data["id"]))
+        ids, content_types, matrix, count = self._embedding_matrix
+        if matrix is None:
+            return None
+        return ids[:count], content_types[:count], matrix[:count]
+
+    def _update_embedding_matrix(self, emb_id: int, content_type: str, unit: list[float]) -> bool:
+        """
+        Apply one store_embedding write to the cached embedding matrix.
+
+        An upserted id has its row replaced; a new id is appended, doubling the
+        buffers when they are full, and moves the known spec_embeddings version
+        along so the next search does not rebuild. Returns False when the write
+        cannot be applied (no matrix yet, mixed or changed dimensions, an id below
+        the newest one).
+        """
+        state = self._embedding_matrix
+        if state is None or state[2] is None:
+            return False
+
+        ids, content_types, matrix, count = state
+        if matrix.shape[1] != len(unit):
+            if count:
+                return False
+            matrix = np.empty((0, len(unit)), np.float32)
+
+        pos = int(np.searchsorted(ids[:count], emb_id))
+        if pos < count and ids[pos] == emb_id:
+            matrix[pos] = unit
+            return True
+        if pos < count:
+            return False
+
+        if count == len(ids) or count == len(matrix):
+            capacity = max(2 * count, 64)
+            grown_ids = np.empty(capacity, ids.dtype)
+            grown_ids[:count] = ids[:count]
+            grown_types = np.empty(capacity, object)
+            grown_types[:count] = content_types[:count]
+            grown_matrix = np.empty((capacity, len(unit)), np.float32)
+            grown_matrix[:count] = matrix[:count]
+            ids, content_types, matrix = grown_ids, grown_types, grown_matrix
+        ids[count] = emb_id
+        content_types[count] = content_type
+        matrix[count] = unit
+        self._embedding_matrix = (ids, content_types, matrix, count + 1)
+        if self._embeddings_version is not None:
+            rows, max_id = self._embeddings_version
+            self._embeddings_version = (rows + 1, max(max_id or 0, emb_id))
+        return True
+
+    def _search_similar_matrix(
+        self,
+        embeddings: tuple,
+        query_embedding: list[float],
+        k: int,
+        content_type: str | None,
+    ) -> list[dict[str, Any]]:
+        """
+        search_similar over the cached embedding matrix.
+
+        One matrix-vector product scores every row; argpartition picks the top k
+        without sorting the rest, and only those rows are read back from DuckDB.
+        """
+        ids, content_types, matrix = embeddings
+        if k <= 0 or not len(ids):
+            return []
+
+        scores = matrix @ np.asarray(_unit_vector(query_embedding), dtype=np.float32)
+        rows = np.arange(len(ids)) if content_type is None else np.flatnonzero(
+            content_types == content_type
+        )
+        scores = scores[rows]
+        if k < len(rows):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        hit_ids = ids[rows[top]].tolist()
+        fetched = {
+            row[0]: row
+            for row in self._read_rows(
+                """
+                SELECT id, spec_id, org_id, content_type, content, metadata
+                FROM spec_embeddings
+                WHERE id IN (SELECT UNNEST(?::INTEGER[]))
+                """,
+                [hit_ids],
+            )
+        }
+        columns = ["id", "spec_id", "org_id", "content_type", "content", "metadata", "similarity"]
+        return [
+            dict(zip(columns, fetched[emb_id] + (float(score),)))
+            for emb_id, score in zip(hit_ids, scores[top].tolist())
+            if emb_id in fetched
+        ]
+
     def hybrid_search(
         self,
         text_query: str,
@@ -1431,6 +1970,8 @@ class SpecEngine:
         """
         Hybrid search combining keyword matching with vector similarity.
 
+        Keywords match as a case-insensitive substring of the content.
+
         Args:
             text_query: Text query for keyword matching
             query_embedding: Query vector for semantic matching
@@ -1441,48 +1982,30 @@ class SpecEngine:
         Returns:
             List of results with hybrid scores
         """
+        self._check_embeddings_version()
+        cache_key = ("hybrid", text_query, tuple(query_embedding), k, content_type, keyword_weight)
+        cached = self._cached_search(cache_key)
+        if cached is not None:
+            return cached
+
+        params = {
+            "text": text_query,
+            "embedding": _unit_vector(query_embedding),
+            "content_type": content_type,
+            "keyword_weight": keyword_weight,
+            "k": k,
+        }
+        columns = ["id", "spec_id", "org_id", "content_type", "content",
+                   "metadata", "keyword_score", "vector_score", "hybrid_score"]
         try:
-            vector_weight = 1.0 - keyword_weight
-            type_filter = f"AND content_type = '{content_type}'" if content_type else ""
-
-            query = f"""
-                WITH keyword_matches AS (
-                    SELECT id, 1.0 AS keyword_score
-                    FROM spec_embeddings
-                    WHERE content ILIKE '%' || ? || '%'
-                    {type_filter}
-                ),
-                vector_matches AS (
-                    SELECT
-                        id,
-                        array_cosine_similarity(embedding, ?::FLOAT[]) AS vector_score
-                    FROM spec_embeddings
-                    WHERE embedding IS NOT NULL
-                    {type_filter}
-                )
-                SELECT
-                    e.id, e.spec_id, e.org_id, e.content_type,
-                    e.content, e.metadata,
-                    COALESCE(k.keyword_score, 0) AS keyword_score,
-                    COALESCE(v.vector_score, 0) AS vector_score,
-                    (COALESCE(k.keyword_score, 0) * {keyword_weight} +
-                     COALESCE(v.vector_score, 0) * {vector_weight}) AS hybrid_score
-                FROM spec_embeddings e
-                LEFT JOIN keyword_matches k ON k.id = e.id
-                LEFT JOIN vector_matches v ON v.id = e.id
-                WHERE k.id IS NOT NULL OR v.id IS NOT NULL
-                ORDER BY hybrid_score DESC
-                LIMIT ?
-            """
-            result = self.con.execute(query, [text_query, query_embedding, k]).fetchall()
-
-            columns = ["id", "spec_id", "org_id", "content_type", "content",
-                       "metadata", "keyword_score", "vector_score", "hybrid_score"]
-            return [dict(zip(columns, row)) for row in result]
+            results = self._read_dicts(_HYBRID_SEARCH_SQL, params, columns)
+            self._cache_search(cache_key, results)
+            return results
 
         except Exception as e:
             return []
 
+    @_serialized_write
     def store_conversation_memory(
         self,
         session_id: str,
@@ -1510,26 +2033,22 @@ class SpecEngine:
         """
         try:
             mem_id = self.con.execute(
-                "SELECT COALESCE(MAX(id), 0) + 1 FROM memory_conversations"
-            ).fetchone()[0]
-
-            self.con.execute(
                 """
                 INSERT INTO memory_conversations
                     (id, session_id, agent_spec_id, role, content, embedding, importance, tool_calls)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (nextval('memory_conversations_seq'), ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
                 """,
                 [
-                    mem_id,
                     session_id,
                     agent_spec_id,
                     role,
                     content,
                     embedding,
                     importance,
-                    json.dumps(tool_calls) if tool_calls else None,
+                    _json.dumps(tool_calls) if tool_calls else None,
                 ]
-            )
+            ).fetchone()[0]
 
             return {"memory_id": mem_id}
 
@@ -1559,20 +2078,17 @@ class SpecEngine:
                 ORDER BY importance DESC, created_at DESC
                 LIMIT ?
             """
-            result = self.con.execute(query, [session_id, k]).fetchall()
-
             columns = ["role", "content", "importance", "created_at"]
-            messages = []
-            for row in result:
-                msg = dict(zip(columns, row))
+            messages = self._read_dicts(query, [session_id, k], columns)
+            for msg in messages:
                 if msg.get("created_at"):
                     msg["created_at"] = str(msg["created_at"])
-                messages.append(msg)
             return messages
 
         except Exception as e:
             return []
 
+    @_serialized_write
     def store_org_knowledge(
         self,
         org: str,
@@ -1594,17 +2110,13 @@ class SpecEngine:
         """
         try:
             if org == "dev":
-                table = "knowledge_dev"
                 entry_id = self.con.execute(
-                    f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
-                ).fetchone()[0]
-                self.con.execute(
                     """
                     INSERT INTO knowledge_dev (id, repo, file_path, language, ast_type, symbol_name, content, embedding, doc_string, version_ref)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (nextval('knowledge_dev_seq'), ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
                     """,
                     [
-                        entry_id,
                         kwargs.get("repo", "unknown"),
                         kwargs.get("file_path", "unknown"),
                         kwargs.get("language"),
@@ -1615,19 +2127,15 @@ class SpecEngine:
                         kwargs.get("doc_string"),
                         kwargs.get("version_ref"),
                     ]
-                )
+                ).fetchone()[0]
             elif org == "research":
-                table = "knowledge_research"
                 entry_id = self.con.execute(
-                    f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
-                ).fetchone()[0]
-                self.con.execute(
                     """
                     INSERT INTO knowledge_research (id, query, source_url, source_title, content, embedding, relevance_score, search_engine)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (nextval('knowledge_research_seq'), ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
                     """,
                     [
-                        entry_id,
                         kwargs.get("query", ""),
                         kwargs.get("source_url"),
                         kwargs.get("source_title"),
@@ -1636,19 +2144,15 @@ class SpecEngine:
                         kwargs.get("relevance_score"),
                         kwargs.get("search_engine", "searxng"),
                     ]
-                )
+                ).fetchone()[0]
             elif org == "studio":
-                table = "knowledge_studio"
                 entry_id = self.con.execute(
-                    f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
-                ).fetchone()[0]
-                self.con.execute(
                     """
                     INSERT INTO knowledge_studio (id, project, decision_type, title, description, content, embedding, rationale, performance)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (nextval('knowledge_studio_seq'), ?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
                     """,
                     [
-                        entry_id,
                         kwargs.get("project", "default"),
                         kwargs.get("decision_type", "general"),
                         kwargs.get("title", "Untitled"),
@@ -1658,29 +2162,25 @@ class SpecEngine:
                         kwargs.get("rationale"),
                         kwargs.get("performance"),
                     ]
-                )
+                ).fetchone()[0]
             elif org == "ops":
-                table = "knowledge_ops"
                 entry_id = self.con.execute(
-                    f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
-                ).fetchone()[0]
-                self.con.execute(
                     """
                     INSERT INTO knowledge_ops (id, pipeline, run_id, status, log_level, content, embedding, metrics, duration_ms)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (nextval('knowledge_ops_seq'), ?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
                     """,
                     [
-                        entry_id,
                         kwargs.get("pipeline", "unknown"),
                         kwargs.get("run_id"),
                         kwargs.get("status"),
                         kwargs.get("log_level", "info"),
                         content,
                         embedding,
-                        json.dumps(kwargs.get("metrics")) if kwargs.get("metrics") else None,
+                        _json.dumps(kwargs.get("metrics")) if kwargs.get("metrics") else None,
                         kwargs.get("duration_ms"),
                     ]
-                )
+                ).fetchone()[0]
             else:
                 return {"error": f"Unknown org: {org}"}
 
@@ -1780,53 +2280,54 @@ def register_spec_engine_tools(con: duckdb.DuckDBPyConnection) -> list[str]:
     # Register spec_list as UDF
     def udf_spec_list(kind: str = None, status: str = None, limit: int = 50) -> str:
         result = engine.spec_list(kind, status, limit)
-        return json.dumps(result)
+        return _json.dumps(result)
 
     try:
         con.create_function("spec_list_udf", udf_spec_list, return_type="VARCHAR")
         registered.append("spec_list_udf")
     except Exception as e:
-        print(f"Failed to register spec_list_udf: {e}", file=sys.stderr)
+        logger.error(f"Failed to register spec_list_udf: {e}")
 
     # Register spec_search as UDF
     def udf_spec_search(query: str, limit: int = 20) -> str:
         result = engine.spec_search(query, limit)
-        return json.dumps(result)
+        return _json.dumps(result)
 
     try:
         con.create_function("spec_search_udf", udf_spec_search, return_type="VARCHAR")
         registered.append("spec_search_udf")
     except Exception as e:
-        print(f"Failed to register spec_search_udf: {e}", file=sys.stderr)
+        logger.error(f"Failed to register spec_search_udf: {e}")
 
     # Register render_from_template as UDF
     def udf_render_template(template_name: str, context_json: str) -> str:
         try:
-            context = json.loads(context_json)
-        except json.JSONDecodeError:
+            context = _json.loads(context_json)
+        except _json.JSONDecodeError:
             context = {}
         result = engine.render_from_template(template_name, context)
-        return json.dumps(result)
+        return _json.dumps(result)
 
     try:
         con.create_function("render_template_udf", udf_render_template, return_type="VARCHAR")
         registered.append("render_template_udf")
     except Exception as e:
-        print(f"Failed to register render_template_udf: {e}", file=sys.stderr)
+        logger.error(f"Failed to register render_template_udf: {e}")
 
     # Register validate_payload as UDF
     def udf_validate_payload(kind: str, name: str, payload_json: str) -> str:
         try:
-            payload = json.loads(payload_json)
-        except json.JSONDecodeError:
-            return json.dumps({"ok": False, "errors": ["Invalid JSON payload"]})
-        result = engine.validate_payload_against_spec(kind, name, payload)
-        return json.dumps(result)
+            _json.loads(payload_json)
+        except _json.JSONDecodeError:
+            return _json.dumps({"ok": False, "errors": ["Invalid JSON payload"]})
+        # Already serialized; validated as given instead of re-encoded
+        result = engine.validate_payload_against_spec(kind, name, payload_json)
+        return _json.dumps(result)
 
     try:
         con.create_function("validate_payload_udf", udf_validate_payload, return_type="VARCHAR")
         registered.append("validate_payload_udf")
     except Exception as e:
-        print(f"Failed to register validate_payload_udf: {e}", file=sys.stderr)
+        logger.error(f"Failed to register validate_payload_udf: {e}")
 
     return registered
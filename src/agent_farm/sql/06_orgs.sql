@@ -13,9 +13,13 @@ CREATE TABLE IF NOT EXISTS orgs (
     model_secondary VARCHAR,
     system_prompt TEXT NOT NULL,
     enabled BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP DEFAULT now()
+    created_at TIMESTAMP DEFAULT now(),
+    config_hash VARCHAR
 );
 
+-- Databases created before config_hash was added
+ALTER TABLE orgs ADD COLUMN IF NOT EXISTS config_hash VARCHAR;
+
 CREATE TABLE IF NOT EXISTS org_tools (
     org_id VARCHAR NOT NULL,
     tool_name VARCHAR NOT NULL,
@@ -19,6 +19,7 @@ CREATE TABLE IF NOT EXISTS spec_embeddings (
     content         VARCHAR NOT NULL,           -- Original text content
     chunk_index     INTEGER DEFAULT 0,          -- For chunked documents
     embedding       FLOAT[],                    -- Vector embedding (dimensions depend on model)
+    embedding_normalized BOOLEAN DEFAULT false, -- Embedding stored at unit length (cosine = dot product)
     embedding_model VARCHAR DEFAULT 'default',  -- Model used for embedding
     metadata        VARCHAR,                    -- JSON metadata
     created_at      TIMESTAMP DEFAULT current_timestamp,
@@ -26,6 +27,9 @@ CREATE TABLE IF NOT EXISTS spec_embeddings (
     UNIQUE (content_hash, chunk_index)
 );
 
+-- Databases created before embedding_normalized existed
+ALTER TABLE spec_embeddings ADD COLUMN IF NOT EXISTS embedding_normalized BOOLEAN DEFAULT false;
+
 -- Indexes for fast lookup
 CREATE INDEX IF NOT EXISTS idx_embeddings_spec ON spec_embeddings(spec_id);
 CREATE INDEX IF NOT EXISTS idx_embeddings_org ON spec_embeddings(org_id);
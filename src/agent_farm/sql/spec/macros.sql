@@ -437,14 +437,12 @@ CREATE OR REPLACE MACRO spec_performance(spec_id_val) AS TABLE (
         o.use_count,
         o.success_rate,
         o.confidence,
-        COUNT(f.id) AS feedback_count,
-        AVG(f.score) AS avg_score,
-        COUNT(a.id) AS adaptation_count
+        -- Counted separately so feedback and adaptations do not multiply each other
+        (SELECT count(*) FROM spec_feedback WHERE spec_id = o.id) AS feedback_count,
+        (SELECT avg(score) FROM spec_feedback WHERE spec_id = o.id) AS avg_score,
+        (SELECT count(*) FROM spec_adaptations WHERE spec_id = o.id) AS adaptation_count
     FROM spec_objects o
-    LEFT JOIN spec_feedback f ON f.spec_id = o.id
-    LEFT JOIN spec_adaptations a ON a.spec_id = o.id
     WHERE o.id = spec_id_val
-    GROUP BY o.id, o.kind, o.name, o.use_count, o.success_rate, o.confidence
 );
 
 -- Get low-performing specs that need improvement
@@ -144,8 +144,9 @@ CREATE INDEX idx_spec_objects_status ON spec_objects(status);
 CREATE INDEX idx_spec_objects_kind_name ON spec_objects(kind, name);
 CREATE INDEX idx_spec_objects_source_type ON spec_objects(source_type);
 CREATE INDEX idx_spec_objects_sync_status ON spec_objects(sync_status);
-CREATE INDEX idx_spec_docs_object_id ON spec_docs(object_id);
-CREATE INDEX idx_spec_payloads_object_id ON spec_payloads(object_id);
+-- One doc and one payload per spec; unique so spec_update can upsert on object_id
+CREATE UNIQUE INDEX idx_spec_docs_object_id ON spec_docs(object_id);
+CREATE UNIQUE INDEX idx_spec_payloads_object_id ON spec_payloads(object_id);
 
 -- Relationship indexes
 CREATE INDEX idx_spec_relationships_from ON spec_relationships(from_id);
@@ -370,6 +371,8 @@ ORDER BY o.confidence DESC, o.use_count DESC;
 -- ============================================================================
 
 -- Spec performance summary
+-- feedback_count and avg_feedback_score match the spec_performance macro and
+-- SpecEngine.get_spec_performance
 CREATE OR REPLACE VIEW spec_performance_view AS
 SELECT
     o.id, o.kind, o.name, o.version,
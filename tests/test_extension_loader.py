@@ -0,0 +1,48 @@
+"""
+Tests for the shared extension loader.
+
+Tests:
+- Installed/loaded extensions skip INSTALL and LOAD
+- Install failures are reported per extension
+"""
+
+import os
+import sys
+
+import duckdb
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agent_farm import extensions
+from agent_farm.extensions import install_and_load_extensions
+
+
+class TestInstallAndLoadExtensions:
+    """Tests for install_and_load_extensions."""
+
+    def test_loaded_extensions_skip_install(self, monkeypatch):
+        """Test that extensions DuckDB already has are not installed again."""
+
+        def fail_install(con, ext):
+            raise AssertionError(f"INSTALL attempted for {ext}")
+
+        monkeypatch.setattr(extensions, "_install_extension", fail_install)
+        con = duckdb.connect(":memory:")
+        assert install_and_load_extensions(con, ["json", "parquet"]) == [
+            ("json", "core", None),
+            ("parquet", "core", None),
+        ]
+
+    def test_failed_install_reported(self, monkeypatch):
+        """Test that a failed install is returned with its error, in input order."""
+        error = duckdb.IOException("offline")
+        monkeypatch.setattr(extensions, "_install_extension", lambda con, ext: (None, error))
+        con = duckdb.connect(":memory:")
+        results = install_and_load_extensions(con, ["not_a_real_ext", "json"])
+        assert results == [("not_a_real_ext", None, error), ("json", "core", None)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,222 @@
+"""
+Tests for the Agent Farm entry point helpers.
+
+Tests the startup helpers in main.py:
+- SQL statement splitting
+- MCP config discovery
+- Script execution with per-statement fallback
+- MCP server table registration
+- Log level configuration
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import duckdb
+
+from agent_farm import schemas
+from agent_farm.main import (
+    _configure_logging,
+    _end_startup_logging,
+    create_agent_tables,
+    create_runtime_tables,
+    execute_sql_script,
+    extract_mcp_servers,
+    find_mcp_config,
+    setup_mcp_tables,
+    split_sql_statements,
+)
+
+
+class TestSplitSqlStatements:
+    """Tests for split_sql_statements."""
+
+    def test_splits_on_semicolons(self):
+        """Test that plain statements are split and stripped."""
+        result = split_sql_statements("SELECT 1;\n  SELECT 2 ;")
+        assert result == ["SELECT 1", "SELECT 2"]
+
+    def test_semicolon_in_string_literal(self):
+        """Test that semicolons and doubled quotes inside literals are kept."""
+        result = split_sql_statements("SELECT 'a;''b'; SELECT \"x;y\";")
+        assert result == ["SELECT 'a;''b'", 'SELECT "x;y"']
+
+    def test_apostrophe_in_comment(self):
+        """Test that a quote inside a line comment does not open a string."""
+        sql = "-- the org's policy\nSELECT 1;\nSELECT 2;"
+        result = split_sql_statements(sql)
+        assert len(result) == 2
+        assert result[1] == "SELECT 2"
+
+    def test_comment_only_statements_skipped(self):
+        """Test that chunks holding only comments are dropped."""
+        result = split_sql_statements("-- header\n;\nSELECT 1;\n-- trailer\n")
+        assert result == ["SELECT 1"]
+
+    def test_without_semicolon(self):
+        """Test the single-statement fast path."""
+        assert split_sql_statements("  SELECT 'x'\n") == ["SELECT 'x'"]
+        assert split_sql_statements("-- only a comment\n") == []
+        assert split_sql_statements("") == []
+
+    def test_trailing_statement_without_semicolon(self):
+        """Test that the last statement is kept without a terminator."""
+        assert split_sql_statements("SELECT 1; SELECT 2") == ["SELECT 1", "SELECT 2"]
+
+
+class TestFindMcpConfig:
+    """Tests for find_mcp_config."""
+
+    def test_finds_project_local_configs(self, tmp_path, monkeypatch):
+        """Test that configs in the working directory are found in order."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        (tmp_path / ".mcp.json").write_text('{"servers": {}}', encoding="utf-8")
+        (tmp_path / "mcp.json").write_text('{"mcpServers": {}}', encoding="utf-8")
+
+        found = find_mcp_config()
+        assert [os.path.basename(path) for path, _ in found] == ["mcp.json", ".mcp.json"]
+        assert found[0][1] == {"mcpServers": {}}
+
+    def test_invalid_json_skipped(self, tmp_path, monkeypatch, caplog):
+        """Test that an unreadable config is reported and the rest still load."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        (tmp_path / "mcp.json").write_text("{not json", encoding="utf-8")
+        (tmp_path / "mcp_config.json").write_text('{"servers": {}}', encoding="utf-8")
+
+        found = find_mcp_config()
+        assert [os.path.basename(path) for path, _ in found] == ["mcp_config.json"]
+        assert "Error reading" in caplog.text
+
+    def test_missing_directories(self, tmp_path, monkeypatch):
+        """Test that absent config directories are skipped quietly."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        assert find_mcp_config() == []
+
+
+class TestExecuteSqlScript:
+    """Tests for execute_sql_script."""
+
+    @pytest.fixture
+    def con(self):
+        """In-memory DuckDB connection."""
+        return duckdb.connect(":memory:")
+
+    def test_runs_whole_script(self, con):
+        """Test that a valid script runs and reports its statement count."""
+        script = "CREATE TABLE t (v VARCHAR); INSERT INTO t VALUES ('a;b');"
+        assert execute_sql_script(con, script, "test") == 2
+        assert con.sql("SELECT v FROM t").fetchall() == [("a;b",)]
+
+    def test_falls_back_per_statement(self, con, caplog):
+        """Test that one bad statement does not discard the others."""
+        script = "CREATE TABLE t (v INTEGER); SELECT missing_fn(); INSERT INTO t VALUES (1);"
+        assert execute_sql_script(con, script, "test") == 2
+        assert con.sql("SELECT count(*) FROM t").fetchone() == (1,)
+        assert "Error in test" in caplog.text
+
+    def test_table_ddl_survives_failing_statement(self, con, monkeypatch, caplog):
+        """Test that one failing DDL statement does not roll back the other tables."""
+        monkeypatch.setattr(
+            schemas,
+            "ALL_TABLES_SQL",
+            schemas.ALL_TABLES_SQL + "\nALTER TABLE missing_table ADD COLUMN x INTEGER;",
+        )
+        create_agent_tables(con)
+        create_runtime_tables(con)
+
+        tables = {row[0] for row in con.sql("SELECT table_name FROM duckdb_tables()").fetchall()}
+        assert {"orgs", "audit_log", "pending_approvals", "notes_board"} <= tables
+        assert "Error in agent tables" in caplog.text
+
+
+class TestExtractMcpServers:
+    """Tests for extract_mcp_servers."""
+
+    def test_both_config_formats(self):
+        """Test that mcpServers and servers blocks are merged, later files winning."""
+        fs = {"command": "npx"}
+        configs = [
+            ("a.json", {"mcpServers": {"fs": fs, "git": {"command": "git"}}}),
+            ("b.json", {"servers": {"git": {"command": "git2"}}}),
+            ("c.json", {"unrelated": True}),
+        ]
+        servers = extract_mcp_servers(configs)
+        assert servers["fs"] == ("a.json", fs)
+        assert servers["git"] == ("b.json", {"command": "git2"})
+        assert len(servers) == 2
+
+
+class TestSetupMcpTables:
+    """Tests for setup_mcp_tables."""
+
+    def test_registers_servers(self):
+        """Test that servers are stored with args lists and env JSON."""
+        con = duckdb.connect(":memory:")
+        servers = {
+            "fs": ("a", {"command": "npx", "args": ["-y", "fs"], "env": {"ROOT": "/tmp"}}),
+            "bare": ("", {}),
+        }
+        setup_mcp_tables(con, servers)
+
+        rows = con.sql(
+            "SELECT name, command, args, env->>'ROOT', source_config FROM mcp_servers ORDER BY name"
+        ).fetchall()
+        assert rows == [("bare", "", [], None, ""), ("fs", "npx", ["-y", "fs"], "/tmp", "a")]
+
+    def test_no_servers(self):
+        """Test that an empty server dict leaves an empty table."""
+        con = duckdb.connect(":memory:")
+        setup_mcp_tables(con, {})
+        assert con.sql("SELECT count(*) FROM mcp_servers").fetchone() == (0,)
+
+
+class TestConfigureLogging:
+    """Tests for the startup log configuration."""
+
+    @pytest.fixture
+    def package_logger(self):
+        """The agent_farm logger, restored after the test."""
+        logger = logging.getLogger("agent_farm")
+        handlers, level = list(logger.handlers), logger.level
+        yield logger
+        logger.handlers[:] = handlers
+        logger.setLevel(level)
+
+    def test_level_from_env(self, package_logger, monkeypatch):
+        """Test that AGENT_FARM_LOG sets the package log level."""
+        monkeypatch.setenv("AGENT_FARM_LOG", "warning")
+        _configure_logging()
+        assert package_logger.level == logging.WARNING
+
+    def test_unknown_level_falls_back_to_info(self, package_logger, monkeypatch):
+        """Test that an invalid level name does not break startup."""
+        monkeypatch.setenv("AGENT_FARM_LOG", "chatty")
+        _configure_logging()
+        assert package_logger.level == logging.INFO
+
+    def test_warnings_not_buffered(self, package_logger, monkeypatch, capsys):
+        """Test that warnings, and every record after startup, reach stderr at once."""
+        monkeypatch.setenv("AGENT_FARM_LOG", "INFO")
+        handler = _configure_logging()
+        package_logger.info("startup detail")
+        assert capsys.readouterr().err == ""
+        package_logger.warning("startup problem")
+        assert capsys.readouterr().err == "startup detail\nstartup problem\n"
+
+        _end_startup_logging(handler)
+        assert handler not in package_logger.handlers
+        package_logger.info("serving")
+        assert capsys.readouterr().err == "serving\n"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
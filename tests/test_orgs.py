@@ -0,0 +1,113 @@
+"""
+Tests for the organization configurations.
+
+Tests:
+- OrgConfig structure and lookups
+- Org seed SQL against the org tables
+"""
+
+import os
+import sys
+from dataclasses import FrozenInstanceError
+
+import duckdb
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agent_farm.orgs import (
+    ORG_CONFIGS,
+    ORG_SYSTEM_PROMPTS,
+    OrgConfig,
+    get_all_org_ids,
+    get_org_config,
+    get_org_prompt,
+    seed_orgs,
+)
+from agent_farm.schemas import ORG_TABLES_SQL, OrgType
+
+
+class TestOrgConfigs:
+    """Tests for the static org configuration table."""
+
+    def test_every_org_type_configured(self):
+        """Test that each OrgType has a config."""
+        assert set(ORG_CONFIGS) == set(OrgType)
+        assert all(isinstance(cfg, OrgConfig) for cfg in ORG_CONFIGS.values())
+
+    def test_configs_are_frozen(self):
+        """Test that configs cannot be mutated at runtime."""
+        with pytest.raises(FrozenInstanceError):
+            ORG_CONFIGS[OrgType.DEV].model_primary = "other"
+
+    def test_approval_tools_are_granted_tools(self):
+        """Test that tools requiring approval are also in the tool list."""
+        for cfg in ORG_CONFIGS.values():
+            assert cfg.tools_requiring_approval <= set(cfg.tools), cfg.id
+
+    def test_lookups(self):
+        """Test get_org_config, get_org_prompt and get_all_org_ids."""
+        assert get_org_config(OrgType.OPS).id == "ops-org"
+        assert get_org_config("missing") is None
+        assert get_org_config("ops") is get_org_config(OrgType.OPS)
+        assert (
+            get_org_prompt(OrgType.DEV) == get_org_prompt("dev") == ORG_SYSTEM_PROMPTS[OrgType.DEV]
+        )
+        assert get_org_prompt("missing") == ""
+        assert get_all_org_ids()[0] == "dev-org"
+        assert get_all_org_ids() == tuple(cfg.id for cfg in ORG_CONFIGS.values())
+
+
+class TestOrgSeed:
+    """Tests for seeding org configs into DuckDB."""
+
+    @pytest.fixture
+    def con(self):
+        """Connection with the org tables created."""
+        con = duckdb.connect(":memory:")
+        con.execute(ORG_TABLES_SQL)
+        return con
+
+    def test_seed_counts(self, con):
+        """Test that every org, tool and denial is seeded."""
+        seed_orgs(con)
+
+        assert con.sql("SELECT count(*) FROM orgs").fetchone()[0] == len(ORG_CONFIGS)
+        tools = sum(len(cfg.tools) for cfg in ORG_CONFIGS.values())
+        assert con.sql("SELECT count(*) FROM org_tools").fetchone()[0] == tools
+        denials = sum(len(cfg.denials) for cfg in ORG_CONFIGS.values())
+        assert con.sql("SELECT count(*) FROM org_denials").fetchone()[0] == denials
+
+    def test_seed_is_idempotent(self, con):
+        """Test that re-seeding upserts instead of failing."""
+        seed_orgs(con)
+        seed_orgs(con)
+
+        assert con.sql("SELECT count(*) FROM orgs").fetchone()[0] == len(ORG_CONFIGS)
+        approval = con.sql(
+            "SELECT requires_approval FROM org_tools "
+            "WHERE org_id = 'ops-org' AND tool_name = 'shell_run'"
+        ).fetchone()
+        assert approval == (True,)
+
+    def test_unchanged_configs_skipped(self, con):
+        """Test that re-seeding writes only orgs whose config_hash changed."""
+        assert seed_orgs(con) == len(ORG_CONFIGS)
+        assert seed_orgs(con) == 0
+
+        con.execute("UPDATE orgs SET config_hash = 'stale' WHERE id = 'dev-org'")
+        con.execute("DELETE FROM org_tools WHERE org_id = 'dev-org'")
+        assert seed_orgs(con) == 1
+        tools = con.sql("SELECT count(*) FROM org_tools WHERE org_id = 'dev-org'").fetchone()
+        assert tools == (len(ORG_CONFIGS[OrgType.DEV].tools),)
+
+    def test_quotes_round_trip(self, con):
+        """Test that prompts with quotes and ';' are stored verbatim."""
+        seed_orgs(con)
+        prompt = con.sql("SELECT system_prompt FROM orgs WHERE id = 'dev-org'").fetchone()[0]
+        assert prompt == ORG_SYSTEM_PROMPTS[OrgType.DEV]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
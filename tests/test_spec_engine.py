@@ -297,6 +297,7 @@ class TestSpecEngineModule:
             result = spec_engine.spec_get(id=spec_id)
             assert result is not None
             assert result["id"] == spec_id
+            assert isinstance(result["created_at"], str)
 
     def test_spec_search(self, spec_engine):
         """Test spec_search method."""
@@ -306,6 +307,11 @@ class TestSpecEngineModule:
         names = [r["name"] for r in result]
         assert "pia" in names
 
+    def test_spec_search_matches_partial_words(self, spec_engine):
+        """Test that spec_search matches partial words."""
+        names = [r["name"] for r in spec_engine.spec_search("PLANN")]
+        assert "pia" in names
+
     def test_validate_payload_success(self, spec_engine):
         """Test validate_payload_against_spec with valid payload."""
         result = spec_engine.validate_payload_against_spec(
@@ -316,6 +322,404 @@ class TestSpecEngineModule:
         # Should succeed or have no schema (ok=True or note about no schema)
         assert "ok" in result or "note" in result
 
+    def test_validate_payload_json_string(self, spec_engine):
+        """Test that a serialized payload validates the same as its dict."""
+        payload = {"name": "test", "role": "planner"}
+        as_dict = spec_engine.validate_payload_against_spec("agent", "pia", payload)
+        as_str = spec_engine.validate_payload_against_spec("agent", "pia", json.dumps(payload))
+        assert as_str == as_dict
+
+    def test_spec_update_upserts_doc_and_payload(self, spec_engine):
+        """Test that spec_update inserts a missing doc and replaces an existing one."""
+        spec_id = spec_engine.spec_create("skill", "upsert_me", "U", payload={"v": 1})["id"]
+        assert spec_engine.spec_update(id=spec_id, doc="first")["updated"]
+        assert spec_engine.spec_update(id=spec_id, doc="second", payload={"v": 2})["updated"]
+
+        spec = spec_engine.spec_get(id=spec_id)
+        assert (spec["doc"], spec["payload"]) == ("second", {"v": 2})
+        docs = spec_engine.con.execute(
+            "SELECT count(*) FROM spec_docs WHERE object_id = ?", [spec_id]
+        ).fetchone()
+        assert docs == (1,)
+
+    def test_meta_learning_ids_from_sequences(self, spec_engine):
+        """Test that meta-learning writes return sequence-assigned IDs."""
+        first = spec_engine.record_learning("rule", "general", "first")
+        second = spec_engine.record_learning("rule", "general", "second")
+        assert second["learning_id"] == first["learning_id"] + 1
+
+        rel = spec_engine.create_relationship(1, 2, "uses")
+        again = spec_engine.create_relationship(1, 2, "uses", metadata={"w": 1})
+        assert again == rel
+
+        entry = spec_engine.store_org_knowledge("ops", "deployed", pipeline="ci")
+        assert entry == {"entry_id": 1, "org": "ops"}
+
+    def test_record_feedback_updates_usage(self, spec_engine):
+        """Test that feedback updates use_count and the running success rate."""
+        spec_id = spec_engine.spec_create("skill", "rated", "R")["id"]
+        assert "feedback_id" in spec_engine.record_feedback(spec_id, "success")
+        spec_engine.record_feedback(spec_id, "failure")
+
+        usage = spec_engine.record_usage(spec_id, was_success=True)
+        assert usage["use_count"] == 3
+        assert usage["success_rate"] == pytest.approx(2 / 3)
+        assert "error" in spec_engine.record_usage(-1, was_success=True)
+
+    def test_record_feedback_many(self, spec_engine):
+        """Test that bulk feedback matches recording the events one by one."""
+        a = spec_engine.spec_create("skill", "bulk_a", "A")["id"]
+        b = spec_engine.spec_create("skill", "bulk_b", "B")["id"]
+        result = spec_engine.record_feedback_many(
+            [
+                {"spec_id": a, "feedback_type": "success", "context": {"k": 1}},
+                {"spec_id": a, "feedback_type": "failure"},
+                {"spec_id": b, "feedback_type": "error", "score": 0.9, "notes": "n"},
+            ]
+        )
+        first = result["feedback_ids"][0]
+        assert result["feedback_ids"] == [first, first + 1, first + 2]
+
+        assert spec_engine.record_usage(a, was_success=True)["success_rate"] == pytest.approx(2 / 3)
+        assert spec_engine.record_usage(b, was_success=False)["success_rate"] == pytest.approx(0.5)
+        assert spec_engine.record_feedback_many([]) == {"feedback_ids": []}
+
+    def test_spec_performance_aggregates(self, spec_engine):
+        """Test that every performance surface counts feedback written by any path."""
+        spec_id = spec_engine.spec_create("skill", "perf_skill", "Perf")["id"]
+        perf = spec_engine.get_spec_performance(spec_id)
+        assert (perf["feedback_count"], perf["avg_score"], perf["adaptation_count"]) == (0, None, 0)
+
+        spec_engine.record_feedback(spec_id, "success", score=1.0)
+        spec_engine.record_feedback_many(
+            [{"spec_id": spec_id, "feedback_type": "failure", "score": -0.5}]
+        )
+        spec_engine.con.execute(
+            "INSERT INTO spec_feedback (id, spec_id, feedback_type, score) "
+            "VALUES (nextval('spec_feedback_seq'), ?, 'success', 0.5)",
+            [spec_id],
+        )
+        spec_engine.record_adaptation(spec_id, "prompt_improve", "r", {"a": 1})
+        spec_engine.con.execute(
+            "INSERT INTO spec_adaptations (id, spec_id, adaptation_type, reason, changes) "
+            "VALUES (nextval('spec_adaptations_seq'), ?, 'tool_add', 'r', '{}')",
+            [spec_id],
+        )
+
+        perf = spec_engine.get_spec_performance(spec_id)
+        assert perf["feedback_count"] == 3
+        assert perf["avg_score"] == pytest.approx(1 / 3)
+        assert perf["adaptation_count"] == 2
+        assert "error" in spec_engine.get_spec_performance(999999)
+
+        macro = spec_engine.con.execute(
+            "SELECT feedback_count, avg_score, adaptation_count FROM spec_performance(?)",
+            [spec_id],
+        ).fetchone()
+        assert macro == (3, pytest.approx(1 / 3), 2)
+        view = spec_engine.con.execute(
+            "SELECT feedback_count, avg_feedback_score FROM spec_performance_view WHERE id = ?",
+            [spec_id],
+        ).fetchone()
+        assert view == (3, pytest.approx(1 / 3))
+
+    def test_read_rows_returns_cursor(self, spec_engine):
+        """Test that _read_rows materializes its rows and returns the cursor to the pool."""
+        rows = spec_engine._read_rows("SELECT i FROM range(5) t(i)")
+        assert rows == [(0,), (1,), (2,), (3,), (4,)]
+        cursor = spec_engine._cursors.get_nowait()
+        spec_engine._cursors.put(cursor)
+
+        for i in range(3):
+            spec_engine.record_learning("rule", "general", f"learning {i}", confidence=0.6 + i / 10)
+        learnings = spec_engine.get_top_learnings(limit=2)
+        assert [lr["description"] for lr in learnings] == ["learning 2", "learning 1"]
+
+    def test_read_dicts_streams_batches(self, spec_engine):
+        """Test that _read_dicts reads past one fetchmany batch and returns the cursor."""
+        rows = spec_engine._read_dicts("SELECT i FROM range(600) t(i)", None, ["i"])
+        assert [row["i"] for row in rows] == list(range(600))
+        cursor = spec_engine._cursors.get_nowait()
+        spec_engine._cursors.put(cursor)
+
+    def test_hybrid_search(self, spec_engine):
+        """Test that hybrid_search blends keyword and vector scores with bound inputs."""
+        spec_engine.store_embedding("duckdb vector search", [1.0, 0.0], "doc")
+        spec_engine.store_embedding("unrelated text", [0.0, 1.0], "doc")
+        spec_engine.store_embedding("o'brien's duckdb notes", [0.6, 0.8], "code")
+
+        results = spec_engine.hybrid_search("DuckDB", [1.0, 0.0], k=5, keyword_weight=0.5)
+        assert [r["content"] for r in results][:2] == [
+            "duckdb vector search",
+            "o'brien's duckdb notes",
+        ]
+        assert results[0]["hybrid_score"] == pytest.approx(1.0)
+        assert results[-1]["keyword_score"] == 0.0
+
+        code = spec_engine.hybrid_search("o'brien", [1.0, 0.0], content_type="code")
+        assert [r["content_type"] for r in code] == ["code"]
+        assert code[0]["keyword_score"] == 1.0
+
+    def test_search_similar(self, spec_engine):
+        """Test that search_similar ranks stored embeddings by cosine similarity."""
+        spec_engine.store_embedding("east", [1.0, 0.0], "doc")
+        spec_engine.store_embedding("north", [0.0, 1.0], "doc")
+        spec_engine.store_embedding("north-east", [0.7, 0.7], "code")
+
+        results = spec_engine.search_similar([1.0, 0.1], k=2)
+        assert [r["content"] for r in results] == ["east", "north-east"]
+        docs = spec_engine.search_similar([0.0, 1.0], content_type="doc")
+        assert [r["content"] for r in docs] == ["north", "east"]
+
+    def test_search_similar_without_numpy(self, spec_engine, monkeypatch):
+        """Test that search_similar ranks in SQL when NumPy is unavailable."""
+        from agent_farm import spec_engine as spec_engine_module
+
+        spec_engine.store_embedding("east", [1.0, 0.0], "doc")
+        spec_engine.store_embedding("north", [0.0, 1.0], "doc")
+        with_numpy = spec_engine.search_similar([1.0, 0.2], k=1)
+
+        spec_engine._search_cache.clear()
+        monkeypatch.setattr(spec_engine_module, "np", None)
+        without_numpy = spec_engine.search_similar([1.0, 0.2], k=1)
+        assert [r["content"] for r in without_numpy] == ["east"]
+        assert without_numpy[0]["similarity"] == pytest.approx(with_numpy[0]["similarity"])
+
+    def test_embedding_matrix_reset_on_store(self, spec_engine):
+        """Test that embeddings from any write path are visible to the next matrix search."""
+        pytest.importorskip("numpy")
+        assert spec_engine.search_similar([1.0, 0.0]) == []
+        spec_engine.store_embedding("east", [1.0, 0.0], "doc")
+        assert [r["content"] for r in spec_engine.search_similar([1.0, 0.0])] == ["east"]
+        spec_engine.con.execute(
+            "INSERT INTO spec_embeddings (id, content_type, content_hash, content, embedding) "
+            "VALUES (100, 'doc', 'outside', 'from sql', [0.6, 0.8])"
+        )
+        assert [r["content"] for r in spec_engine.search_similar([0.0, 1.0])] == [
+            "from sql",
+            "east",
+        ]
+        spec_engine.store_embedding("wide", [1.0, 0.0, 0.0], "doc")
+        assert spec_engine._load_embedding_matrix() is None
+
+    def test_store_embedding_updates_matrix_in_place(self, spec_engine):
+        """Test that store_embedding updates the cached matrix instead of rebuilding it."""
+        pytest.importorskip("numpy")
+        spec_engine.store_embedding("east", [1.0, 0.0], "doc")
+        spec_engine.search_similar([1.0, 0.0])
+        spec_engine.store_embedding("north", [0.0, 2.0], "code")
+        matrix = spec_engine._embedding_matrix[2]
+
+        spec_engine.store_embedding("east", [0.0, -1.0], "doc")
+        spec_engine.store_embedding("west", [-1.0, 0.0], "doc")
+        results = spec_engine.search_similar([0.0, 1.0])
+        assert spec_engine._embedding_matrix[2] is matrix
+        assert [r["content"] for r in results] == ["north", "west", "east"]
+        assert results[2]["similarity"] == pytest.approx(-1.0)
+        code = spec_engine.search_similar([0.0, 1.0], content_type="code")
+        assert [r["content"] for r in code] == ["north"]
+
+    def test_store_embedding_upserts_repeated_content(self, spec_engine):
+        """Test that storing the same content again updates the existing row."""
+        first = spec_engine.store_embedding("chunk", [1.0, 0.0], "code")
+        again = spec_engine.store_embedding("chunk", [0.0, 1.0], "code")
+        assert again == first
+        stored = spec_engine.con.execute(
+            "SELECT count(*), any_value(embedding) FROM spec_embeddings"
+        ).fetchone()
+        assert stored == (1, [0.0, 1.0])
+
+    def test_embeddings_stored_normalized(self, spec_engine):
+        """Test that embeddings are stored at unit length and legacy rows still rank."""
+        spec_engine.store_embedding("scaled", [3.0, 4.0], "doc")
+        stored = spec_engine.con.execute(
+            "SELECT embedding, embedding_normalized FROM spec_embeddings"
+        ).fetchone()
+        assert stored[0] == pytest.approx([0.6, 0.8])
+        assert stored[1] is True
+
+        spec_engine.con.execute(
+            "INSERT INTO spec_embeddings (id, content_type, content_hash, content, embedding) "
+            "VALUES (100, 'doc', 'legacy', 'legacy', [10.0, 0.0])"
+        )
+        results = spec_engine.search_similar([2.0, 0.0])
+        assert [r["content"] for r in results] == ["legacy", "scaled"]
+        assert [r["similarity"] for r in results] == pytest.approx([1.0, 0.6])
+
+    def test_search_results_cached(self, spec_engine, monkeypatch):
+        """Test that repeated searches are served from the cache until an embedding is stored."""
+        spec_engine.store_embedding("east", [1.0, 0.0], "doc")
+        first = spec_engine.search_similar([1.0, 0.0])
+        first[0]["content"] = "mutated by caller"
+
+        def fail_read(*args):
+            raise AssertionError("search hit the database")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(spec_engine, "_read_rows", fail_read)
+            assert spec_engine.search_similar([1.0, 0.0])[0]["content"] == "east"
+
+        spec_engine.store_embedding("north", [0.0, 1.0], "doc")
+        assert len(spec_engine.search_similar([1.0, 0.0])) == 2
+
+    def test_search_cache_sees_outside_writes(self, spec_engine):
+        """Test that embeddings written outside store_embedding invalidate cached searches."""
+        spec_engine.store_embedding("duckdb notes", [1.0, 0.0], "doc")
+        assert len(spec_engine.hybrid_search("duckdb", [1.0, 0.0])) == 1
+
+        spec_engine.con.execute(
+            "INSERT INTO spec_embeddings (id, content_type, content_hash, content, embedding) "
+            "VALUES (100, 'doc', 'outside', 'duckdb from sql', [0.0, 1.0])"
+        )
+        results = spec_engine.hybrid_search("duckdb", [1.0, 0.0])
+        assert [r["content"] for r in results] == ["duckdb notes", "duckdb from sql"]
+
+        spec_engine.spec_create("skill", "cache_clear", "Clears search cache")
+        assert not spec_engine._search_cache
+
+    def test_reads_from_udf(self, spec_engine):
+        """Test that engine reads inside a UDF do not wait on the UDF's own query."""
+        con = spec_engine.con
+
+        def count_agents(limit: int) -> int:
+            return len(spec_engine.spec_list(kind="agent", limit=limit))
+
+        con.create_function("count_agents_udf", count_agents)
+        (count,) = con.execute("SELECT count_agents_udf(50)").fetchone()
+        assert count == len(spec_engine.spec_list(kind="agent"))
+
+    def test_concurrent_writers(self, spec_engine):
+        """Test that writer transactions from several threads do not interleave."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        spec_id = spec_engine.spec_create("skill", "busy_skill", "Busy")["id"]
+
+        def write(i: int) -> dict:
+            if i % 2:
+                return spec_engine.record_feedback(spec_id, "success", score=1.0)
+            return spec_engine.spec_create_many(
+                [{"kind": "skill", "name": f"bulk_{i}", "summary": "B"}]
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(write, range(40)))
+
+        assert not [r for r in results if "error" in r]
+        assert spec_engine.record_usage(spec_id, was_success=True)["use_count"] == 21
+
+    def test_spec_delete_removes_doc_and_payload(self, spec_engine):
+        """Test that spec_delete removes the object with its doc and payload."""
+        created = spec_engine.spec_create("skill", "delete_me", "D", doc="d", payload={"d": 1})
+        spec_id = created["id"]
+        assert spec_engine.spec_delete(spec_id) == {"deleted": True}
+
+        assert spec_engine.spec_get(id=spec_id) is None
+        leftovers = spec_engine.con.execute(
+            "SELECT (SELECT count(*) FROM spec_docs WHERE object_id = $id), "
+            "(SELECT count(*) FROM spec_payloads WHERE object_id = $id)",
+            {"id": spec_id},
+        ).fetchone()
+        assert leftovers == (0, 0)
+
+    def test_schema_lookup_cached(self, spec_engine):
+        """Test that schema lookups are cached until a spec is written."""
+        spec_engine.validate_payload_against_spec("agent", "pia", {"name": "x"})
+        assert spec_engine._schema_cache[("agent", "pia")][0] == "agent_config_schema"
+
+        spec_engine.spec_create("skill", "cache_buster", "Clears caches")
+        assert spec_engine._schema_cache == {}
+
+    def test_schema_cache_sees_outside_writes(self, spec_engine):
+        """Test that schema lookups see SQL writes and do not cache misses."""
+        result = spec_engine.validate_payload_against_spec("schema", "late_schema", {})
+        assert result["ok"] is False
+        assert ("schema", "late_schema") not in spec_engine._schema_cache
+
+        spec_engine.validate_payload_against_spec("agent", "pia", {"name": "x"})
+        assert ("agent", "pia") in spec_engine._schema_cache
+        spec_engine.con.execute(
+            "UPDATE spec_objects SET status = 'deprecated', updated_at = current_timestamp "
+            "WHERE kind = 'agent' AND name = 'pia'"
+        )
+        result = spec_engine.validate_payload_against_spec("agent", "pia", {"name": "x"})
+        assert ("agent", "pia") not in spec_engine._schema_cache
+        assert result.get("note") == "No schema_ref defined for this spec"
+
+    def test_spec_create_ids_follow_seed(self, spec_engine):
+        """Test that sequence-assigned IDs start after the seeded rows."""
+        max_id = spec_engine.con.execute("SELECT MAX(id) FROM spec_objects").fetchone()[0]
+        first = spec_engine.spec_create("skill", "seq_a", "A", doc="a", payload={"a": 1})
+        second = spec_engine.spec_create("skill", "seq_b", "B", doc="b", payload={"b": 2})
+        assert first == {"id": max_id + 1, "created": True}
+        assert second["id"] == max_id + 2
+        assert spec_engine.spec_get(id=second["id"])["doc"] == "b"
+
+    def test_spec_create_many(self, spec_engine):
+        """Test bulk creation and rollback on a duplicate spec."""
+        result = spec_engine.spec_create_many(
+            [
+                {"kind": "skill", "name": "bulk_a", "summary": "A", "doc": "doc a"},
+                {"kind": "skill", "name": "bulk_b", "summary": "B", "payload": {"b": 1}},
+            ]
+        )
+        assert result["created"] is True
+        first, second = (spec_engine.spec_get(id=spec_id) for spec_id in result["ids"])
+        assert (first["name"], first["doc"]) == ("bulk_a", "doc a")
+        assert (second["name"], second["payload"]) == ("bulk_b", {"b": 1})
+
+        duplicate = spec_engine.spec_create_many(
+            [
+                {"kind": "skill", "name": "bulk_c", "summary": "C"},
+                {"kind": "skill", "name": "bulk_a", "summary": "A again"},
+            ]
+        )
+        assert duplicate["created"] is False
+        assert spec_engine.spec_get(kind="skill", name="bulk_c") is None
+
+    def test_split_sql_quote_in_comment(self):
+        """Test that an apostrophe in a comment does not swallow later statements."""
+        from agent_farm.spec_engine import SpecEngine
+
+        engine = SpecEngine(duckdb.connect(":memory:"))
+        sql = "-- the org's macros\nSELECT 1;\nSELECT 'a;b';\n-- trailer\n"
+        assert len(engine._split_sql(sql)) == 2
+        assert engine._scan_sql(sql) == ["-- the org's macros\nSELECT 1", "SELECT 'a;b'"]
+
+    def test_sql_file_falls_back(self, tmp_path):
+        """Test that a failing script is retried statement by statement."""
+        from agent_farm.spec_engine import SpecEngine
+
+        sql_file = tmp_path / "seed.sql"
+        sql_file.write_text(
+            "CREATE TABLE t (v INTEGER); SELECT missing_fn(); INSERT INTO t VALUES (1);",
+            encoding="utf-8",
+        )
+        con = duckdb.connect(":memory:")
+        engine = SpecEngine(con)
+        assert engine._load_sql_file(str(sql_file)) == 2
+        assert con.sql("SELECT count(*) FROM t").fetchone() == (1,)
+
+    def test_template_source_cached(self, spec_engine):
+        """Test that template sources are cached until a spec is written."""
+        spec_engine.render_from_template("plan_pia_swarm", {})
+        assert "plan_pia_swarm" in spec_engine._template_cache
+
+        spec_engine.spec_update(id=30, summary="Updated summary")
+        assert spec_engine._template_cache == {}
+
+        spec_engine.render_from_template("plan_pia_swarm", {})
+        spec_engine.con.execute(
+            "UPDATE spec_objects SET status = 'deprecated', updated_at = current_timestamp "
+            "WHERE name = 'plan_pia_swarm'"
+        )
+        result = spec_engine.render_from_template("plan_pia_swarm", {})
+        assert "plan_pia_swarm" not in spec_engine._template_cache
+        assert "not found" in result["error"]
+
+        result = spec_engine.render_from_template("missing_template", {})
+        assert result["rendered"] is None
+        assert "missing_template" not in spec_engine._template_cache
+
     def test_get_stats(self, spec_engine):
         """Test get_stats method."""
         result = spec_engine.get_stats()